@@ -4,16 +4,19 @@ import os
 _config_cache = None
 
 def load_config():
-    global _config_cache
-    if _config_cache is not None:
-        return _config_cache
     """
     Load configuration from config.json + secrets
     
+    The result is cached for the life of the process; call
+    clear_config_cache() to pick up edits to config.json.
+    
     Secrets come from:
     - Environment variables (when deployed on Railway)
     - secrets.json (when running locally)
     """
+    global _config_cache
+    if _config_cache is not None:
+        return _config_cache
     
     # Load non-secret configuration
     with open('config.json', 'r', encoding='utf-8') as f:
@@ -41,4 +44,10 @@ def load_config():
             raise Exception("secrets.json not found! Create it with your API keys.")
     
     _config_cache = config
-    return config
\ No newline at end of file
+    return config
+
+
+def clear_config_cache():
+    """Drop the cached config so the next load_config() re-reads the files"""
+    global _config_cache
+    _config_cache = None
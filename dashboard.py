@@ -1,11 +1,26 @@
-from flask import Flask, render_template_string, request, redirect, session, jsonify
+from flask import Flask, render_template, request, redirect, session, jsonify, Response, abort, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from config import load_config
-from datetime import datetime, timezone
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import wraps
+from jinja2 import FileSystemBytecodeCache, FileSystemLoader
+from markupsafe import Markup
+from requests.adapters import HTTPAdapter
+from typing import Optional
+from urllib3.util.retry import Retry
+from werkzeug.security import check_password_hash
 import secrets
 import hmac
 import hashlib
 import requests
+import gzip
 import os
+import threading
+import time
+import zlib
 
 import models.user as user_model
 import models.manager as manager_model
@@ -17,8 +32,61 @@ import models.usage as usage_model
 import models.feedback as feedback_model
 from utils.db_connection import init_connection_pool, close_all_connections
 
-app = Flask(__name__)
+try:
+    import markupsafe._speedups  # noqa: F401  (C escape() used by Jinja autoescape)
+except ImportError:
+    print("WARNING: markupsafe C speedups unavailable; HTML escaping runs in pure Python")
+
+try:
+    import orjson
+except ImportError:  # optional: Flask's stdlib json provider is used instead
+    orjson = None
+
+# static/ is served by the stylesheet() route from memory, not Flask's file route
+app = Flask(__name__, static_folder=None)
 app.secret_key = secrets.token_hex(16)
+# The password is checked once at login; after that the signed session cookie is enough
+app.permanent_session_lifetime = timedelta(hours=12)
+# Strip the whitespace left by block tags, and keep compiled file templates
+# on disk so a restarted worker skips recompiling them.
+app.jinja_options = {
+    **app.jinja_options,
+    "trim_blocks": True,
+    "lstrip_blocks": True,
+    "bytecode_cache": FileSystemBytecodeCache(),
+}
+
+def _strip_indentation(source):
+    """Drop indentation and blank lines (done once per file, not per response)"""
+    return "".join(f"{line}\n" for line in map(str.strip, source.splitlines()) if line)
+
+class _IndentStrippingLoader(FileSystemLoader):
+    """Template loader that hands Jinja the source without its indentation"""
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        return _strip_indentation(source), filename, uptodate
+
+# None of the pages use <pre>/<textarea> or white-space: pre, so leading
+# whitespace in the template files is only bytes on the wire.
+app.jinja_loader = _IndentStrippingLoader(os.path.join(app.root_path, app.template_folder))
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask's JSON provider with orjson doing the encoding and decoding.
+    Datetimes and anything else orjson doesn't know are handed to Flask's
+    default(), so the output matches the stdlib provider's.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 
 # CSRF Protection
 def generate_csrf_token():
@@ -28,25 +96,102 @@ def generate_csrf_token():
 
 app.jinja_env.globals['csrf_token'] = generate_csrf_token
 
+def csrf_hidden_input():
+    """The session's CSRF token as a ready-made hidden <input>, built once per render"""
+    return Markup('<input type="hidden" name="csrf_token" value="{}">').format(generate_csrf_token())
+
 def verify_csrf_token(token):
     """Verify CSRF token matches session"""
     return token and token == session.get('csrf_token')
 
-# Simple password protection
+def admin_required(view):
+    """Redirect to the login page unless the session is authenticated"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not session.get("authenticated"):
+            return redirect("/login")
+        return view(*args, **kwargs)
+    return wrapper
+
+def csrf_required(view):
+    """Reject POSTs whose form CSRF token doesn't match the session (apply under admin_required)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not verify_csrf_token(request.form.get('csrf_token')):
+            return "Invalid CSRF token", 403
+        return view(*args, **kwargs)
+    return wrapper
+
+# Simple password protection. Prefer DASHBOARD_PASSWORD_HASH (a werkzeug
+# generate_password_hash() string) so the plaintext never sits in the environment.
+DASHBOARD_PASSWORD_HASH = os.environ.get('DASHBOARD_PASSWORD_HASH')
 DASHBOARD_PASSWORD = os.environ.get('DASHBOARD_PASSWORD')
-if not DASHBOARD_PASSWORD:
-    raise Exception("DASHBOARD_PASSWORD environment variable not set. Please set it in Railway dashboard.")
+if not DASHBOARD_PASSWORD_HASH and not DASHBOARD_PASSWORD:
+    raise Exception("DASHBOARD_PASSWORD_HASH or DASHBOARD_PASSWORD environment variable not set. Please set it in Railway dashboard.")
+_DASHBOARD_PASSWORD_BYTES = (DASHBOARD_PASSWORD or '').encode('utf-8')
+
+def check_dashboard_password(password):
+    """Check a login attempt against the configured hash (or plaintext fallback)"""
+    if DASHBOARD_PASSWORD_HASH:
+        return check_password_hash(DASHBOARD_PASSWORD_HASH, password)
+    return hmac.compare_digest(password.encode('utf-8'), _DASHBOARD_PASSWORD_BYTES)
+
+# Dashboard data cache: the overview page polls /api/dashboard every 30s, so the
+# assembled data is reused for a few seconds instead of re-querying.
+DASH_TTL = 10  # seconds
+_DASH_CACHE = {"t": 0.0, "ctx": None}
+_CONVERSATIONS_CACHE = {"t": 0.0, "ctx": None}
+
+# Data version per cached context: a hash of everything but the build time, so
+# a rebuild with unchanged data keeps its ETag and the poll keeps getting 304s.
+_DASH_VERSION = {"entry": (None, None)}
+
+def _dashboard_version():
+    """(context, data version) for the current dashboard context"""
+    ctx = _get_dashboard_context()
+    cached_ctx, version = _DASH_VERSION["entry"]
+    if cached_ctx is not ctx:
+        data = app.json.dumps({k: v for k, v in ctx.items() if k != "now"})
+        version = hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+        _DASH_VERSION["entry"] = (ctx, version)
+    return ctx, version
+
+def _dashboard_etag(version):
+    """ETag for the page and its poll: data version plus the CSRF token their forms embed"""
+    return hashlib.blake2b(f"{version}:{generate_csrf_token()}".encode(), digest_size=16).hexdigest()
+
+def invalidate_dashboard_cache():
+    """Force the next dashboard hit to rebuild (call after admin mutations)"""
+    _DASH_CACHE["t"] = 0.0
+    _CONVERSATIONS_CACHE["t"] = 0.0
 
 # ============================================
 # LEMON SQUEEZY WEBHOOK HANDLER
 # ============================================
 
+# (secret, keyed HMAC) — the key schedule is computed once and copied per request
+_webhook_mac = (None, None)
+
 def verify_signature(payload_body, signature_header, secret):
     """Verify Lemon Squeezy webhook signature"""
-    computed_signature = hmac.new(
-        secret.encode("utf-8"), payload_body, hashlib.sha256
-    ).hexdigest()
-    return hmac.compare_digest(computed_signature, signature_header)
+    global _webhook_mac
+    cached_secret, keyed_mac = _webhook_mac
+    if cached_secret != secret:
+        keyed_mac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+        _webhook_mac = (secret, keyed_mac)
+    mac = keyed_mac.copy()
+    mac.update(payload_body)
+    return hmac.compare_digest(mac.hexdigest().encode("ascii"), signature_header.encode("utf-8"))
+
+# One keep-alive session for Bot API calls, so webhook bursts reuse the TLS
+# connection. Only connection failures are retried: a retried read could
+# deliver the same message twice.
+_telegram_session = requests.Session()
+_telegram_session.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=10,
+    max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2),
+))
+TELEGRAM_TIMEOUT = 5
 
 def send_telegram_notification(chat_id, text):
     """Send Telegram message directly via Bot API"""
@@ -54,8 +199,9 @@ def send_telegram_notification(chat_id, text):
         config = load_config()
         token = config["telegram_token"]
         url = f"https://api.telegram.org/bot{token}/sendMessage"
-        response = requests.post(
-            url, json={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"}
+        response = _telegram_session.post(
+            url, json={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"},
+            timeout=TELEGRAM_TIMEOUT,
         )
         if response.status_code == 200:
             print(f"Notification sent to {chat_id}")
@@ -64,6 +210,14 @@ def send_telegram_notification(chat_id, text):
     except Exception as e:
         print(f"Error sending notification: {e}")
 
+# Notifications are sent off the request thread so the webhook can return
+# to Lemon Squeezy as soon as the database is updated.
+_notify_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="telegram-notify")
+
+def notify_telegram(chat_id, text):
+    """Queue a Telegram notification; errors are logged by send_telegram_notification"""
+    _notify_executor.submit(send_telegram_notification, chat_id, text)
+
 @app.route("/webhook/lemonsqueezy", methods=["POST"])
 def lemonsqueezy_webhook():
     """Handle Lemon Squeezy webhook events"""
@@ -90,21 +244,11 @@ def lemonsqueezy_webhook():
         telegram_id = int(telegram_id)
         print(f"Processing event: {event_name} for telegram_id: {telegram_id}")
 
-        handler_map = {
-            "subscription_created": handle_subscription_created,
-            "subscription_updated": handle_subscription_updated,
-            "subscription_cancelled": handle_subscription_cancelled,
-            "subscription_resumed": handle_subscription_resumed,
-            "subscription_expired": handle_subscription_expired,
-            "subscription_paused": handle_subscription_paused,
-            "subscription_unpaused": handle_subscription_unpaused,
-            "subscription_payment_success": handle_subscription_payment_success,
-            "subscription_payment_failed": handle_subscription_payment_failed,
-            "subscription_payment_recovered": handle_subscription_payment_recovered,
-        }
-        handler = handler_map.get(event_name)
+        handler = _EVENT_HANDLERS.get(event_name)
         if handler:
+            started = time.perf_counter()
             handler(telegram_id, data)
+            _record_webhook(event_name, time.perf_counter() - started)
         else:
             print(f"Unhandled event: {event_name}")
 
@@ -124,7 +268,7 @@ def handle_subscription_created(telegram_id: int, data: dict):
         ends_at=attrs.get("ends_at"),
     )
     usage_model.reset(telegram_id)
-    send_telegram_notification(telegram_id,
+    notify_telegram(telegram_id,
         "✅ *Subscription Active!*\n\nYou now have unlimited messages.\nThank you for subscribing to BridgeOS! 🎉")
 
 def handle_subscription_updated(telegram_id: int, data: dict):
@@ -148,13 +292,13 @@ def handle_subscription_cancelled(telegram_id: int, data: dict):
     subscription_model.update_status(manager_id=telegram_id, status="cancelled", ends_at=attrs.get("ends_at"))
     ends_at_display = (attrs.get("ends_at", "end of billing period")[:10]
                        if attrs.get("ends_at") else "end of billing period")
-    send_telegram_notification(telegram_id,
+    notify_telegram(telegram_id,
         f"⚠️ *Subscription Cancelled*\n\nYou'll keep access until {ends_at_display}.\nYou can resubscribe anytime.")
 
 def handle_subscription_resumed(telegram_id: int, data: dict):
     subscription_model.update_status(manager_id=telegram_id, status="active", ends_at=None)
     usage_model.unblock(telegram_id)
-    send_telegram_notification(telegram_id,
+    notify_telegram(telegram_id,
         "✅ *Subscription Resumed!*\n\nYour subscription is active again.\nWelcome back! 🎉")
 
 def handle_subscription_expired(telegram_id: int, data: dict):
@@ -164,7 +308,7 @@ def handle_subscription_expired(telegram_id: int, data: dict):
     free_limit = config.get('free_message_limit', 50)
     if usage and usage.get('messages_sent', 0) >= free_limit:
         usage_model.block(telegram_id)
-    send_telegram_notification(telegram_id,
+    notify_telegram(telegram_id,
         "❌ *Subscription Expired*\n\nYour subscription has ended.\nYou're back on the free tier (50 messages).\n\nSubscribe again to continue unlimited messaging.")
 
 def handle_subscription_paused(telegram_id: int, data: dict):
@@ -182,7 +326,7 @@ def handle_subscription_payment_failed(telegram_id: int, data: dict):
     message = "⚠️ *Payment Failed*\n\nYour last payment didn't go through.\nWe'll retry automatically in 3 days.\n\n"
     if portal_url:
         message += f"Update your payment method: {portal_url}"
-    send_telegram_notification(telegram_id, message)
+    notify_telegram(telegram_id, message)
 
 def handle_subscription_payment_recovered(telegram_id: int, data: dict):
     subscription = subscription_model.get_by_manager(telegram_id)
@@ -190,507 +334,120 @@ def handle_subscription_payment_recovered(telegram_id: int, data: dict):
         subscription_model.update_status(manager_id=telegram_id, status="active")
     usage_model.unblock(telegram_id)
 
+# Per-event handler call count and total seconds, served at /metrics. Only
+# known event names are recorded, so the label set stays bounded.
+_WEBHOOK_METRICS = {}
+_WEBHOOK_METRICS_LOCK = threading.Lock()
+
+def _record_webhook(event_name, seconds):
+    with _WEBHOOK_METRICS_LOCK:
+        count, total = _WEBHOOK_METRICS.get(event_name, (0, 0.0))
+        _WEBHOOK_METRICS[event_name] = (count + 1, total + seconds)
+
+# Lemon Squeezy event name -> handler, built once rather than per webhook
+_EVENT_HANDLERS = {
+    "subscription_created": handle_subscription_created,
+    "subscription_updated": handle_subscription_updated,
+    "subscription_cancelled": handle_subscription_cancelled,
+    "subscription_resumed": handle_subscription_resumed,
+    "subscription_expired": handle_subscription_expired,
+    "subscription_paused": handle_subscription_paused,
+    "subscription_unpaused": handle_subscription_unpaused,
+    "subscription_payment_success": handle_subscription_payment_success,
+    "subscription_payment_failed": handle_subscription_payment_failed,
+    "subscription_payment_recovered": handle_subscription_payment_recovered,
+}
+
 # ============================================
 # HTML TEMPLATES
 # ============================================
-DASHBOARD_HTML = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>BridgeOS Dashboard</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta http-equiv="refresh" content="30">
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-            background: #f5f5f5;
-            padding: 20px;
-            line-height: 1.6;
-        }
-        .container { max-width: 1200px; margin: 0 auto; }
-        .header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            position: relative;
-        }
-        .header h1 { font-size: 32px; margin-bottom: 10px; }
-        .header p { opacity: 0.9; font-size: 14px; }
-        .stats {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }
-        .stat-card {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        .stat-card h3 {
-            font-size: 14px;
-            color: #666;
-            text-transform: uppercase;
-            margin-bottom: 10px;
-        }
-        .stat-card .number {
-            font-size: 36px;
-            font-weight: bold;
-            color: #667eea;
-        }
-        .section {
-            background: white;
-            padding: 25px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        .section h2 {
-            font-size: 20px;
-            margin-bottom: 20px;
-            color: #333;
-            border-bottom: 2px solid #667eea;
-            padding-bottom: 10px;
-        }
-        .user-card {
-            background: #f9f9f9;
-            padding: 15px;
-            margin-bottom: 15px;
-            border-radius: 8px;
-            border-left: 4px solid #667eea;
-        }
-        .user-card.worker { border-left-color: #48bb78; }
-        .user-card h3 {
-            font-size: 16px;
-            margin-bottom: 10px;
-            color: #333;
-        }
-        .user-info {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 10px;
-            font-size: 14px;
-            color: #666;
-        }
-        .user-info div { padding: 5px 0; }
-        .user-info strong { color: #333; display: inline-block; min-width: 100px; }
-        .badge {
-            display: inline-block;
-            padding: 4px 10px;
-            border-radius: 20px;
-            font-size: 12px;
-            font-weight: bold;
-        }
-        .badge.connected { background: #48bb78; color: white; }
-        .badge.disconnected { background: #f56565; color: white; }
-        .badge.subscribed { background: #4299e1; color: white; }
-        .badge.pending { background: #ed8936; color: white; }
-        .conversation {
-            background: #f9f9f9;
-            padding: 15px;
-            margin-bottom: 15px;
-            border-radius: 8px;
-        }
-        .conversation h3 {
-            font-size: 14px;
-            margin-bottom: 10px;
-            color: #667eea;
-        }
-        .message {
-            padding: 8px;
-            margin: 5px 0;
-            font-size: 13px;
-            border-left: 3px solid #ddd;
-            padding-left: 12px;
-        }
-        .message.from-manager { border-left-color: #667eea; }
-        .message.from-worker { border-left-color: #48bb78; }
-        .message-time {
-            font-size: 11px;
-            color: #999;
-            margin-right: 8px;
-        }
-        .btn {
-            display: inline-block;
-            padding: 8px 16px;
-            background: #667eea;
-            color: white;
-            text-decoration: none;
-            border-radius: 5px;
-            font-size: 14px;
-            border: none;
-            cursor: pointer;
-            margin-right: 5px;
-        }
-        .btn:hover { background: #5568d3; }
-        .btn.danger { background: #f56565; }
-        .btn.danger:hover { background: #e53e3e; }
-        .actions { margin-top: 10px; }
-        .logout {
-            position: absolute;
-            top: 20px;
-            right: 20px;
-            background: rgba(255,255,255,0.2);
-            color: white;
-            padding: 8px 16px;
-            border-radius: 5px;
-            text-decoration: none;
-            font-size: 14px;
-        }
-        .logout:hover { background: rgba(255,255,255,0.3); }
-        .workers-list {
-            margin: 10px 0;
-            padding: 10px;
-            background: #f0f0f0;
-            border-radius: 5px;
-        }
-        .worker-item {
-            padding: 5px 0;
-            font-size: 13px;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <a href="/logout" class="logout">ðŸšª Logout</a>
-            <h1>ðŸŒ‰ BridgeOS Dashboard</h1>
-            <p>Real-time monitoring â€¢ Auto-refresh every 30 seconds â€¢ Last updated: {{ now }}</p>
-        </div>
-
-        <div class="stats">
-            <div class="stat-card">
-                <h3>Total Managers</h3>
-                <div class="number">{{ stats.total_managers }}</div>
-            </div>
-            <div class="stat-card">
-                <h3>Total Workers</h3>
-                <div class="number">{{ stats.total_workers }}</div>
-            </div>
-            <div class="stat-card">
-                <h3>Active Connections</h3>
-                <div class="number">{{ stats.active_connections }}</div>
-            </div>
-            <div class="stat-card">
-                <h3>Total Messages</h3>
-                <div class="number">{{ stats.total_messages }}</div>
-            </div>
-            <div class="stat-card">
-                <h3>Subscriptions</h3>
-                <div class="number">{{ stats.total_subscriptions }}</div>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>ðŸ‘” Managers</h2>
-            {% if managers %}
-                {% for manager in managers %}
-                <div class="user-card">
-                    <h3>Manager ID: {{ manager.id }}</h3>
-                    <div class="user-info">
-                        <div><strong>Code:</strong> {{ manager.code }}</div>
-                        <div><strong>Language:</strong> {{ manager.language }}</div>
-                        <div><strong>Gender:</strong> {{ manager.gender }}</div>
-                        <div><strong>Industry:</strong> {{ manager.industry }}</div>
-                        <div><strong>Messages Sent:</strong> {{ manager.messages_sent }} / {{ manager.message_limit }}</div>
-                        <div>
-                            <strong>Status:</strong>
-                            {% if manager.blocked %}
-                                <span class="badge disconnected">ðŸš« Blocked</span>
-                            {% else %}
-                                <span class="badge connected">âœ“ Active</span>
-                            {% endif %}
-                        </div>
-                        <div>
-                            <strong>Subscription:</strong>
-                            {% if manager.subscription %}
-                                <span class="badge subscribed">ðŸ’³ {{ manager.subscription.status|title }}</span>
-                            {% else %}
-                                <span class="badge disconnected">Free Tier</span>
-                            {% endif %}
-                        </div>
-                    </div>
-                    
-                    <!-- âœ… NEW: Multi-Worker Display -->
-                    <div style="margin-top: 15px;">
-                        <strong>Workers ({{ manager.worker_count }} connected{% if manager.pending_count > 0 %}, {{ manager.pending_count }} pending{% endif %}):</strong>
-                        {% if manager.workers_display %}
-                            <div class="workers-list">
-                                {% for worker_info in manager.workers_display %}
-                                <div class="worker-item">
-                                    â€¢ Bot {{ worker_info.bot_id|upper }}: Worker {{ worker_info.worker_id }} 
-                                    <span class="badge connected">{{ worker_info.status|title }}</span>
-                                </div>
-                                {% endfor %}
-                                {% if manager.pending_bots %}
-                                    {% for bot_id in manager.pending_bots %}
-                                    <div class="worker-item">
-                                        â€¢ Bot {{ bot_id|upper }}: <span class="badge pending">â³ Pending Invitation</span>
-                                    </div>
-                                    {% endfor %}
-                                {% endif %}
-                            </div>
-                        {% else %}
-                            <div class="workers-list">
-                                <div class="worker-item" style="color: #999;">No workers connected yet</div>
-                            </div>
-                        {% endif %}
-                    </div>
-                    
-                    <div class="actions">
-                        <a href="/manager/{{ manager.id }}" class="btn">ðŸ‘ï¸ View Details</a>
-                        <form method="POST" action="/delete_user/{{ manager.id }}" style="display:inline;" 
-                              onsubmit="return confirm('Delete this manager and all their data?');">
-                            <input type="hidden" name="csrf_token" value="{{ csrf_token() }}">
-                            <button type="submit" class="btn danger">ðŸ—‘ï¸ Delete Manager</button>
-                        </form>
-                        {% if manager.blocked %}
-                        <form method="POST" action="/reset_usage/{{ manager.id }}" style="display:inline;">
-                            <input type="hidden" name="csrf_token" value="{{ csrf_token() }}">
-                            <button type="submit" class="btn">ðŸ”„ Reset Usage</button>
-                        </form>
-                        {% endif %}
-                    </div>
-                </div>
-                {% endfor %}
-            {% else %}
-                <p style="color: #999;">No managers registered yet.</p>
-            {% endif %}
-        </div>
-
-        <div class="section">
-            <h2>ðŸ‘·Workers</h2>
-            {% if workers %}
-                {% for worker in workers %}
-                <div class="user-card worker">
-                    <h3>Worker ID: {{ worker.id }}</h3>
-                    <div class="user-info">
-                        <div><strong>Language:</strong> {{ worker.language }}</div>
-                        <div><strong>Gender:</strong> {{ worker.gender }}</div>
-                        <div><strong>Manager:</strong> {{ worker.manager }}</div>
-                        <div><strong>Bot ID:</strong> {{ worker.bot_id }}</div>
-                    </div>
-                    <div class="actions">
-                        <form method="POST" action="/delete_user/{{ worker.id }}" style="display:inline;"
-                            onsubmit="return confirm('Delete this worker?');">
-                            <input type="hidden" name="csrf_token" value="{{ csrf_token() }}">
-                            <button type="submit" class="btn danger">ðŸ—‘ï¸ Delete Worker</button>
-                        </form>
-                    </div>
-                </div>
-                {% endfor %}
-            {% else %}
-                <p style="color: #999;">No workers registered yet.</p>
-            {% endif %}
-        </div>
-
-        <div class="section">
-            <h2>ðŸ’³ Subscriptions</h2>
-            {% if subscriptions_list %}
-                {% for sub in subscriptions_list %}
-                <div class="user-card">
-                    <h3>Telegram ID: {{ sub.telegram_id }}</h3>
-                    <div class="user-info">
-                        <div><strong>Status:</strong> 
-                            {% if sub.status == 'active' %}
-                                <span class="badge subscribed">âœ“ Active</span>
-                            {% elif sub.status == 'cancelled' %}
-                                <span class="badge disconnected">âš ï¸ Cancelled</span>
-                            {% elif sub.status == 'expired' %}
-                                <span class="badge disconnected">âŒ Expired</span>
-                            {% elif sub.status == 'paused' %}
-                                <span class="badge disconnected">â¸ï¸ Paused</span>
-                            {% endif %}
-                        </div>
-                        <div><strong>Plan:</strong> {{ sub.plan|title }}</div>
-                        <div><strong>Started:</strong> {{ sub.started_at[:10] }}</div>
-                        <div><strong>Renews:</strong> {{ sub.renews_at[:10] if sub.renews_at else 'N/A' }}</div>
-                        {% if sub.ends_at %}
-                        <div><strong>Ends:</strong> {{ sub.ends_at[:10] }}</div>
-                        {% endif %}
-                        {% if sub.cancelled_at %}
-                        <div><strong>Cancelled:</strong> {{ sub.cancelled_at[:10] }}</div>
-                        {% endif %}
-                        <div><strong>Lemon ID:</strong> {{ sub.lemon_subscription_id }}</div>
-                    </div>
-                    <div class="actions">
-                        {% if sub.customer_portal_url %}
-                        <a href="{{ sub.customer_portal_url }}" target="_blank" class="btn">ðŸ”— Customer Portal</a>
-                        {% endif %}
-                    </div>
-                </div>
-                {% endfor %}
-            {% else %}
-                <p style="color: #999;">No subscriptions yet.</p>
-            {% endif %}
-        </div>
-
-        <div class="section">
-            <h2>ðŸ’¬ Recent Conversations</h2>
-            {% if conversations_list %}
-                {% for conv in conversations_list %}
-                <div class="conversation">
-                    <h3>{{ conv.user1 }} â†” {{ conv.user2 }}</h3>
-                    {% for msg in conv.messages %}
-                    <div class="message {{ 'from-manager' if msg.is_manager else 'from-worker' }}">
-                        <span class="message-time">{{ msg.time }}</span>
-                        <strong>{{ msg.from_role }}:</strong> {{ msg.text }} <em>({{ msg.lang }})</em>
-                    </div>
-                    {% endfor %}
-                    <div class="actions">
-                        <form method="POST" action="/clear_conversation/{{ conv.key }}" style="display:inline;"
-                              onsubmit="return confirm('Clear this conversation history?');">
-                            <input type="hidden" name="csrf_token" value="{{ csrf_token() }}">
-                            <button type="submit" class="btn danger">ðŸ§¹ Clear History</button>
-                        </form>
-                    </div>
-                </div>
-                {% endfor %}
-            {% else %}
-                <p style="color: #999;">No conversations yet.</p>
-            {% endif %}
-        </div>
-        <div class="section">
-            <h2>ðŸ’¬ User Feedback</h2>
-            {% if feedback_list %}
-                {% for fb in feedback_list %}
-                <div class="user-card">
-                    <h3>{{ fb.user_name }}{% if fb.username %} (@{{ fb.username }}){% endif %}</h3>
-                    <div class="user-info">
-                        <div><strong>User ID:</strong> {{ fb.telegram_user_id }}</div>
-                        <div><strong>Date:</strong> {{ fb.created_at.strftime('%Y-%m-%d %H:%M') if fb.created_at else 'N/A' }}</div>
-                        <div>
-                            <strong>Status:</strong>
-                            {% if fb.status == 'read' %}
-                                <span class="badge connected">âœ… Read</span>
-                            {% else %}
-                                <span class="badge disconnected">â­• Unread</span>
-                            {% endif %}
-                        </div>
-                    </div>
-                    <div style="background: #f9f9f9; padding: 15px; border-radius: 5px; margin: 10px 0; border-left: 4px solid #667eea;">
-                        <strong>Message:</strong><br>
-                        {{ fb.message }}
-                    </div>
-                    <div class="actions">
-                        {% if fb.status == 'unread' %}
-                        <form method="POST" action="/mark_feedback_read/{{ fb.id }}" style="display:inline;">
-                            <input type="hidden" name="csrf_token" value="{{ csrf_token() }}">
-                            <button type="submit" class="btn">âœ… Mark as Read</button>
-                        </form>
-                        {% endif %}
-                    </div>
-                </div>
-                {% endfor %}
-            {% else %}
-                <p style="color: #999;">No feedback received yet.</p>
-            {% endif %}
-        </div>
-    </div>
-</body>
-</html>
-"""
-
-LOGIN_HTML = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>BridgeOS Dashboard - Login</title>
-    <meta charset="UTF-8">
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            height: 100vh;
-        }
-        .login-box {
-            background: white;
-            padding: 40px;
-            border-radius: 10px;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.3);
-            width: 100%;
-            max-width: 400px;
-        }
-        .login-box h1 {
-            font-size: 28px;
-            margin-bottom: 10px;
-            color: #333;
-        }
-        .login-box p {
-            color: #666;
-            margin-bottom: 30px;
-        }
-        .form-group {
-            margin-bottom: 20px;
-        }
-        .form-group label {
-            display: block;
-            margin-bottom: 8px;
-            color: #333;
-            font-weight: 500;
-        }
-        .form-group input {
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #ddd;
-            border-radius: 5px;
-            font-size: 16px;
-        }
-        .form-group input:focus {
-            outline: none;
-            border-color: #667eea;
-        }
-        .btn {
-            width: 100%;
-            padding: 12px;
-            background: #667eea;
-            color: white;
-            border: none;
-            border-radius: 5px;
-            font-size: 16px;
-            font-weight: 500;
-            cursor: pointer;
-        }
-        .btn:hover { background: #5568d3; }
-        .error {
-            background: #fee;
-            color: #c33;
-            padding: 12px;
-            border-radius: 5px;
-            margin-bottom: 20px;
-            border-left: 4px solid #c33;
-        }
-    </style>
-</head>
-<body>
-    <div class="login-box">
-        <h1>ðŸŒ‰ BridgeOS</h1>
-        <p>Dashboard Login</p>
-        {% if error %}
-        <div class="error">{{ error }}</div>
-        {% endif %}
-        <form method="POST">
-            <div class="form-group">
-                <label>Password</label>
-                <input type="hidden" name="csrf_token" value="{{ csrf_token() }}">
-                <input type="password" name="password" placeholder="Enter dashboard password" required autofocus>
-            </div>
-            <button type="submit" class="btn">Login</button>
-        </form>
-    </div>
-</body>
-</html>
-"""
+
+# Page styles and scripts live in static/ and are served as separate cacheable
+# files instead of being inlined into every page response. They are read once
+# at startup; the hash versions the URL.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+def _load_static(filename):
+    with open(os.path.join(STATIC_DIR, filename), encoding="utf-8") as f:
+        body = _strip_indentation(f.read())
+    return body, hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+
+STYLESHEETS = {name: _load_static(f"{name}.css") for name in ("dashboard", "login", "manager_detail")}
+SCRIPTS = {name: _load_static(f"{name}.js") for name in ("manager_detail",)}
+
+def stylesheet_url(name):
+    """Versioned stylesheet URL so a CSS change busts browser caches"""
+    return f"/static/{name}.css?v={STYLESHEETS[name][1]}"
+
+def script_url(name):
+    """Versioned script URL, as stylesheet_url()"""
+    return f"/static/{name}.js?v={SCRIPTS[name][1]}"
+
+app.jinja_env.globals.update(stylesheet_url=stylesheet_url, script_url=script_url)
+
+# Status -> badge markup for subscriptions and feedback, looked up once per row
+STATUS_BADGE = {
+    'active': Markup('<span class="badge subscribed">✓ Active</span>'),
+    'cancelled': Markup('<span class="badge disconnected">⚠️ Cancelled</span>'),
+    'expired': Markup('<span class="badge disconnected">❌ Expired</span>'),
+    'paused': Markup('<span class="badge disconnected">⏸️ Paused</span>'),
+    'read': Markup('<span class="badge connected">✅ Read</span>'),
+    'unread': Markup('<span class="badge disconnected">⭕ Unread</span>'),
+}
+
+# Display titles for the fixed status/plan values (schema CHECK constraints)
+STATUS_TITLE = {
+    'free': 'Free', 'active': 'Active', 'cancelled': 'Cancelled',
+    'expired': 'Expired', 'paused': 'Paused',
+}
+PLAN_TITLE = {'monthly': 'Monthly'}
+app.jinja_env.globals.update(STATUS_TITLE=STATUS_TITLE, PLAN_TITLE=PLAN_TITLE)
+
+@app.template_filter('status_badge')
+def status_badge(status):
+    """Render a status as its badge (empty for unknown statuses)"""
+    return STATUS_BADGE.get(status, '')
+
+
+# ============================================
+# RESPONSE COMPRESSION
+# ============================================
+
+GZIP_MIN_SIZE = 500
+_COMPRESSIBLE_TYPES = frozenset(('text/html', 'text/css', 'text/javascript', 'application/json'))
+
+def _gzip_stream(chunks):
+    """Compress a streamed body chunk by chunk, flushing so each chunk still goes out"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+@app.after_request
+def gzip_response(response):
+    """Gzip text responses for clients that accept it"""
+    if (response.status_code != 200 or response.direct_passthrough
+            or response.mimetype not in _COMPRESSIBLE_TYPES
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.accept_encodings):
+        return response
+
+    if response.is_streamed:
+        response.response = _gzip_stream(response.iter_encoded())
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < GZIP_MIN_SIZE:
+            return response
+        response.set_data(gzip.compress(body, compresslevel=6))
+
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    # The compressed bytes differ from the plain ones, so the validator becomes weak
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
 
 
 # ============================================
@@ -701,12 +458,13 @@ LOGIN_HTML = """
 def login():
     if request.method == "POST":
         password = request.form.get("password", "")
-        if hmac.compare_digest(password.encode(), DASHBOARD_PASSWORD.encode()):
+        if check_dashboard_password(password):
+            session.permanent = True
             session["authenticated"] = True
             return redirect("/")
         else:
-            return render_template_string(LOGIN_HTML, error="Invalid password")
-    return render_template_string(LOGIN_HTML)
+            return render_template("login.html", error="Invalid password", csrf_input=csrf_hidden_input())
+    return render_template("login.html", csrf_input=csrf_hidden_input())
 
 @app.route("/logout")
 def logout():
@@ -714,135 +472,234 @@ def logout():
     return redirect("/login")
 
 @app.route("/")
+@admin_required
 def dashboard():
+    # The session cookie is written before the body streams, so make sure the
+    # CSRF token exists now rather than being minted mid-render.
+    csrf_input = csrf_hidden_input()
+    ctx, version = _dashboard_version()
+    etag = _dashboard_etag(version)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        stream = app.jinja_env.get_template("dashboard.html").stream(**ctx, csrf_input=csrf_input)
+        stream.enable_buffering(5)
+        response = Response(stream_with_context(stream), mimetype="text/html")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+@app.route("/api/dashboard")
+def dashboard_fragment():
+    """The page's refreshable sections as one HTML fragment, for the 30s poll"""
     if not session.get("authenticated"):
-        return redirect("/login")
-
+        return "", 401
+    csrf_input = csrf_hidden_input()
+    ctx, version = _dashboard_version()
+    etag = _dashboard_etag(version)
+    # The browser revalidates each poll; an unchanged dashboard answers 304
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(render_template("dashboard_fragment.html", **ctx, csrf_input=csrf_input),
+                            mimetype="text/html")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+@app.route("/api/conversations")
+def conversations_fragment():
+    """Recent conversations as an HTML fragment, fetched after the page loads"""
+    if not session.get("authenticated"):
+        return "", 401
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    # Only the first page (what every poll asks for) is cached
+    if offset:
+        page = _build_conversations_page(offset)
+    else:
+        page = _cached(_CONVERSATIONS_CACHE, _build_conversations_page)
+    return render_template("conversations.html", **page, offset=offset, csrf_input=csrf_hidden_input())
+
+def _cached(cache, build):
+    """Return cache["ctx"], rebuilding it with build() once the TTL expires"""
+    if time.monotonic() - cache["t"] < DASH_TTL:
+        return cache["ctx"]
+    ctx = build()
+    cache["ctx"] = ctx
+    cache["t"] = time.monotonic()
+    return ctx
+
+def _get_dashboard_context():
+    """Return the cached dashboard context, rebuilding it once the TTL expires"""
+    return _cached(_DASH_CACHE, _build_dashboard_context)
+
+# Subscription statuses that still grant access (cancelled runs until its end date)
+_ACTIVE_SUB_STATUSES = frozenset(('active', 'cancelled'))
+
+# Display rows for the dashboard lists. Fields used only for display keep
+# their raw (possibly None) value; the templates supply the fallbacks.
+@dataclass(slots=True)
+class ManagerRow:
+    id: int
+    code: str
+    language: Optional[str]
+    gender: Optional[str]
+    industry: Optional[str]
+    message_limit: int
+    messages_sent: int
+    subscription: Optional[dict]
+    blocked: bool
+    workers_display: list
+    worker_count: int
+    pending_bots: list = field(default_factory=list)
+    pending_count: int = 0
+
+@dataclass(slots=True)
+class WorkerRow:
+    id: int
+    language: Optional[str]
+    gender: Optional[str]
+    manager: Optional[int]
+    bot_id: Optional[str]
+
+@dataclass(slots=True)
+class SubscriptionRow:
+    telegram_id: int
+    status: str
+    started_at: str
+    renews_at: Optional[str]
+    ends_at: Optional[str]
+    lemon_subscription_id: Optional[str]
+    customer_portal_url: Optional[str]
+    plan: str = 'monthly'
+    cancelled_at: Optional[str] = None
+
+@dataclass(slots=True)
+class FeedbackRow:
+    id: int
+    telegram_user_id: int
+    user_name: Optional[str]
+    username: Optional[str]
+    message: Optional[str]
+    created_at: Optional[str]
+    status: str
+
+@dataclass(slots=True)
+class MessageRow:
+    time: str
+    text: str
+    is_manager: bool
+    lang: str = ''
+
+def _build_dashboard_context():
+    """Run all dashboard queries and assemble the template context"""
     config = load_config()
     message_limit = config.get("free_message_limit", 50)
 
     # ---- Managers ----
+    # Each manager's worker list comes from the worker rows below (they
+    # already carry manager_id/bot_slot), and so does its worker count.
+    all_workers = worker_model.get_all_active()
+    workers_by_manager = {}
+    for w in sorted((w for w in all_workers if w['manager_id']), key=lambda w: w['bot_slot']):
+        workers_by_manager.setdefault(w['manager_id'], []).append(
+            {'worker_id': w['worker_id'], 'bot_id': f"bot{w['bot_slot']}",
+             'bot_label': f"BOT{w['bot_slot']}", 'status': 'active'}
+        )
     all_managers = manager_model.get_all_active()
+    mgr_ids = [m['manager_id'] for m in all_managers]
+    usage_by_id = usage_model.get_many(mgr_ids)
+    subs_by_id = subscription_model.get_by_managers(mgr_ids)
     managers = []
     for mgr in all_managers:
         manager_id = mgr['manager_id']
-        user = user_model.get_by_id(manager_id)
-        manager_data = {
-            'id': manager_id,
-            'code': mgr['code'],
-            'language': mgr.get('language', user['language'] if user else 'Unknown'),
-            'gender': user.get('gender', 'N/A') if user else 'N/A',
-            'industry': mgr['industry'],
-            'message_limit': message_limit,
-        }
-        usage = usage_model.get(manager_id)
-        manager_data['messages_sent'] = usage['messages_sent'] if usage else 0
-        subscription = subscription_model.get_by_manager(manager_id)
-        manager_data['subscription'] = subscription
-        if subscription and subscription.get('status') in ['active', 'cancelled']:
-            manager_data['blocked'] = False
+        usage = usage_by_id.get(manager_id)
+        subscription = subs_by_id.get(manager_id)
+        if subscription and subscription.get('status') in _ACTIVE_SUB_STATUSES:
+            blocked = False
         else:
-            manager_data['blocked'] = usage.get('is_blocked', False) if usage else False
-        connections = connection_model.get_active_for_manager(manager_id)
-        workers_display = [
-            {'worker_id': c['worker_id'], 'bot_id': f"bot{c['bot_slot']}", 'status': 'active'}
-            for c in connections
-        ]
-        manager_data['workers_display'] = workers_display
-        manager_data['worker_count'] = len(workers_display)
-        manager_data['pending_bots'] = []
-        manager_data['pending_count'] = 0
-        managers.append(manager_data)
+            blocked = usage.get('is_blocked', False) if usage else False
+        workers_display = workers_by_manager.get(manager_id, [])
+        managers.append(ManagerRow(
+            manager_id, mgr['code'], mgr['language'], mgr['gender'], mgr['industry'],
+            message_limit, usage['messages_sent'] if usage else 0, subscription, blocked,
+            workers_display, len(workers_display),
+        ))
 
     # ---- Workers ----
-    all_workers = worker_model.get_all_active()
     workers = [
-        {'id': w['worker_id'], 'language': w.get('language', 'Unknown'),
-         'gender': w.get('gender', 'N/A'), 'manager': w.get('manager_id', 'N/A'),
-         'bot_id': f"bot{w['bot_slot']}" if w.get('bot_slot') else 'N/A'}
+        WorkerRow(w['worker_id'], w.get('language'), w.get('gender'), w.get('manager_id'),
+                  f"bot{w['bot_slot']}" if w.get('bot_slot') else None)
         for w in all_workers
     ]
 
-    # ---- Conversations ----
-    recent_conversations = message_model.get_recent_across_connections(limit_per_connection=10)
-    conversations_list = []
-    for conv in recent_conversations:
-        formatted_messages = []
-        for msg in conv['messages']:
-            msg_time = msg['sent_at'].strftime("%H:%M") if msg['sent_at'] else "??:??"
-            is_manager = msg['sender_id'] == conv['manager_id']
-            formatted_messages.append({
-                'time': msg_time,
-                'text': msg['original_text'],
-                'lang': '',
-                'is_manager': is_manager,
-                'from_role': 'Manager' if is_manager else 'Worker',
-            })
-        conversations_list.append({
-            'key': f"{conv['connection_id']}",
-            'user1': f"{conv['manager_name'] or conv['manager_id']}",
-            'user2': f"{conv['worker_name'] or conv['worker_id']}",
-            'messages': formatted_messages,
-        })
-
     # ---- Subscriptions ----
     all_subscriptions = subscription_model.get_all()
-    active_subscriptions = sum(1 for s in all_subscriptions if s.get('status') in ['active', 'cancelled'])
-    subscriptions_list = []
-    for sub in all_subscriptions:
-        renews_str = sub['renews_at'].isoformat() if sub.get('renews_at') else None
-        ends_str = sub['ends_at'].isoformat() if sub.get('ends_at') else None
-        created_str = sub['created_at'].isoformat() if sub.get('created_at') else ''
-        subscriptions_list.append({
-            'telegram_id': sub['manager_id'], 'status': sub['status'], 'plan': 'monthly',
-            'started_at': created_str, 'renews_at': renews_str, 'ends_at': ends_str,
-            'cancelled_at': None, 'lemon_subscription_id': sub.get('external_id', 'N/A'),
-            'customer_portal_url': sub.get('customer_portal_url'),
-        })
+    subscriptions_list = [
+        SubscriptionRow(
+            sub['manager_id'], sub['status'], sub['started_at_str'] or '',
+            sub['renews_at_str'], sub['ends_at_str'],
+            sub.get('external_id', 'N/A'), sub.get('customer_portal_url'),
+        )
+        for sub in all_subscriptions
+    ]
 
     # ---- Feedback ----
     feedback_list = [
-        {'id': fb['feedback_id'], 'telegram_user_id': fb['user_id'],
-         'user_name': fb.get('telegram_name', 'Unknown'), 'username': fb.get('username'),
-         'message': fb.get('message', ''), 'created_at': fb.get('created_at'),
-         'status': fb.get('status', 'unread')}
+        FeedbackRow(fb['feedback_id'], fb['user_id'], fb.get('telegram_name'), fb.get('username'),
+                    fb.get('message'), fb['created_at_str'], fb.get('status', 'unread'))
         for fb in feedback_model.get_all(limit=50)
     ]
 
     # ---- Stats ----
-    all_active_connections = connection_model.get_all_active()
     stats = {
         'total_managers': len(managers), 'total_workers': len(workers),
-        'active_connections': len(all_active_connections),
-        'total_messages': message_model.get_total_count(),
-        'total_subscriptions': active_subscriptions,
+        'active_connections': connection_model.count_active(),
+        'total_messages': message_model.get_total_count_cached(),
+        'total_subscriptions': subscription_model.count_by_statuses(_ACTIVE_SUB_STATUSES),
     }
 
-    return render_template_string(
-        DASHBOARD_HTML, managers=managers, workers=workers,
-        conversations_list=conversations_list, subscriptions_list=subscriptions_list,
+    return dict(
+        managers=managers, workers=workers,
+        subscriptions_list=subscriptions_list,
         feedback_list=feedback_list, stats=stats,
-        now=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        now=time.strftime("%Y-%m-%d %H:%M:%S"),
     )
 
+CONVERSATIONS_PAGE_SIZE = 20
+
+def _build_conversations_page(offset=0):
+    """One page of recent messages grouped per connection, for the conversations fragment"""
+    # Fetch one extra conversation to know whether another page exists
+    recent_conversations = message_model.get_recent_across_connections(
+        limit_per_connection=10, limit=CONVERSATIONS_PAGE_SIZE + 1, offset=offset)
+    conversations_list = [
+        {
+            'key': str(conv['connection_id']),
+            'user1': str(conv['manager_name'] or conv['manager_id']),
+            'user2': str(conv['worker_name'] or conv['worker_id']),
+            'messages': [
+                MessageRow(m['time_str'], m['original_text'], m['is_manager'])
+                for m in conv['messages']
+            ],
+        }
+        for conv in recent_conversations[:CONVERSATIONS_PAGE_SIZE]
+    ]
+    next_offset = offset + CONVERSATIONS_PAGE_SIZE if len(recent_conversations) > CONVERSATIONS_PAGE_SIZE else None
+    return {'conversations_list': conversations_list, 'next_offset': next_offset}
+
 @app.route("/delete_user/<int:user_id>", methods=["POST"])
+@admin_required
+@csrf_required
 def delete_user(user_id):
-    if not session.get("authenticated"):
-        return redirect("/login")
-    csrf_token = request.form.get('csrf_token')
-    if not verify_csrf_token(csrf_token):
-        return "Invalid CSRF token", 403
-
     user = user_model.get_by_id(user_id)
     if not user:
         return redirect("/")
 
     role = manager_model.get_role(user_id)
     if role == 'manager':
-        connections = connection_model.get_active_for_manager(user_id)
-        for conn in connections:
-            connection_model.disconnect(conn['connection_id'])
-            worker_model.soft_delete(conn['worker_id'])
+        disconnected = connection_model.disconnect_all_for_manager(user_id)
+        worker_model.soft_delete_many([c['worker_id'] for c in disconnected])
         manager_model.soft_delete(user_id)
     elif role == 'worker':
         conn = connection_model.get_active_for_worker(user_id)
@@ -851,689 +708,278 @@ def delete_user(user_id):
         worker_model.soft_delete(user_id)
 
     user_model.delete(user_id)
+    invalidate_dashboard_cache()
     return redirect("/")
 
 @app.route("/clear_conversation/<int:connection_id>", methods=["POST"])
+@admin_required
+@csrf_required
 def clear_conversation_route(connection_id):
-    if not session.get("authenticated"):
-        return redirect("/login")
-    csrf_token = request.form.get('csrf_token')
-    if not verify_csrf_token(csrf_token):
-        return "Invalid CSRF token", 403
     message_model.delete_for_connection(connection_id)
+    invalidate_dashboard_cache()
     return redirect("/")
 
 @app.route("/reset_usage/<int:user_id>", methods=["POST"])
+@admin_required
+@csrf_required
 def reset_usage_route(user_id):
-    if not session.get("authenticated"):
-        return redirect("/login")
-    csrf_token = request.form.get('csrf_token')
-    if not verify_csrf_token(csrf_token):
-        return "Invalid CSRF token", 403
     usage_model.reset(user_id)
+    invalidate_dashboard_cache()
     return redirect("/")
 
+def _static_response(files, name, mimetype):
+    if name not in files:
+        abort(404)
+    body, etag = files[name]
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    # Pages link a content-hashed ?v= URL, so a cached copy never goes stale
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response.make_conditional(request)
+
+@app.route("/static/<name>.css")
+def stylesheet(name):
+    """Serve page CSS with long-lived caching; ETag lets stale caches revalidate"""
+    return _static_response(STYLESHEETS, name, "text/css")
+
+@app.route("/static/<name>.js")
+def script(name):
+    """Serve page JavaScript, cached like the stylesheets"""
+    return _static_response(SCRIPTS, name, "text/javascript")
+
+# Polled by the platform every few seconds; the body never changes
+_HEALTH_BODY = b'{"status": "healthy"}'
+
 @app.route("/health", methods=["GET"])
+@app.route("/healthz", methods=["GET"])
 def health_check():
-    """Health check endpoint"""
-    return jsonify({"status": "healthy"}), 200
+    """Health check endpoint (normally answered by HealthCheckMiddleware first)"""
+    return Response(_HEALTH_BODY, status=200, mimetype="application/json")
+
+class HealthCheckMiddleware:
+    """Answer health probes in WSGI, before Flask opens the session or runs any hooks"""
+
+    PATHS = frozenset(("/health", "/healthz"))
+    HEADERS = [("Content-Type", "application/json"), ("Content-Length", str(len(_HEALTH_BODY)))]
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        method = environ.get("REQUEST_METHOD")
+        if environ.get("PATH_INFO") in self.PATHS and method in ("GET", "HEAD"):
+            start_response("200 OK", list(self.HEADERS))
+            return [b"" if method == "HEAD" else _HEALTH_BODY]
+        return self.wsgi_app(environ, start_response)
+
+app.wsgi_app = HealthCheckMiddleware(app.wsgi_app)
+
+# Scrapers authenticate with "Authorization: Bearer $METRICS_TOKEN"; a logged-in
+# admin session works too. Without the variable only the session does.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+def metrics_authorized():
+    """Admin session, or a bearer token matching METRICS_TOKEN"""
+    if session.get("authenticated"):
+        return True
+    auth = request.headers.get("Authorization", "")
+    if not METRICS_TOKEN or not auth.startswith("Bearer "):
+        return False
+    return hmac.compare_digest(auth[len("Bearer "):].encode("utf-8"), METRICS_TOKEN.encode("utf-8"))
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Webhook handler counts and latency in Prometheus text format"""
+    if not metrics_authorized():
+        return Response("Unauthorized\n", status=401, mimetype="text/plain",
+                        headers={"WWW-Authenticate": "Bearer"})
+    with _WEBHOOK_METRICS_LOCK:
+        snapshot = sorted(_WEBHOOK_METRICS.items())
+    lines = [
+        "# HELP bridgeos_webhook_handler_seconds Time spent handling Lemon Squeezy webhook events.",
+        "# TYPE bridgeos_webhook_handler_seconds summary",
+    ]
+    for event_name, (count, total) in snapshot:
+        lines.append(f'bridgeos_webhook_handler_seconds_count{{event="{event_name}"}} {count}')
+        lines.append(f'bridgeos_webhook_handler_seconds_sum{{event="{event_name}"}} {total:.6f}')
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
 
 @app.route("/mark_feedback_read/<int:feedback_id>", methods=["POST"])
+@admin_required
+@csrf_required
 def mark_feedback_read_route(feedback_id):
-    if not session.get("authenticated"):
-        return redirect("/login")
-    csrf_token = request.form.get('csrf_token')
-    if not verify_csrf_token(csrf_token):
-        return "Invalid CSRF token", 403
     feedback_model.mark_as_read(feedback_id)
+    invalidate_dashboard_cache()
     return redirect("/")
 
 # ============================================
-# MANAGER DETAIL PAGE
+# MANAGER DETAIL PAGE (templates/manager_detail.html)
 # ============================================
-MANAGER_DETAIL_HTML = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Manager {{ manager.id }} - BridgeOS Dashboard</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif;
-            background: #f5f5f5;
-            padding: 20px;
-            line-height: 1.6;
-        }
-        .container { max-width: 1200px; margin: 0 auto; }
-        .header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-        }
-        .header-left {
-            flex: 1;
-        }
-        .header-left h1 { 
-            font-size: 28px; 
-            margin-bottom: 8px; 
-        }
-        .header-left p { 
-            opacity: 0.9; 
-            font-size: 14px; 
-            margin: 0;
-        }
-        .header-right {
-            display: flex;
-            flex-direction: column;
-            gap: 10px;
-            align-items: flex-end;
-        }
-        .back-btn, .logout {
-            background: rgba(255,255,255,0.2);
-            color: white;
-            padding: 8px 16px;
-            border-radius: 5px;
-            text-decoration: none;
-            font-size: 14px;
-            white-space: nowrap;
-        }
-        .back-btn:hover, .logout:hover { 
-            background: rgba(255,255,255,0.3); 
-        }
-        .section {
-            background: white;
-            padding: 25px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        .section h2 {
-            font-size: 20px;
-            margin-bottom: 20px;
-            color: #333;
-            border-bottom: 2px solid #667eea;
-            padding-bottom: 10px;
-        }
-        .info-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 15px;
-            margin-bottom: 15px;
-        }
-        .info-item {
-            padding: 10px 0;
-        }
-        .info-item label {
-            display: block;
-            font-size: 12px;
-            color: #666;
-            text-transform: uppercase;
-            margin-bottom: 5px;
-        }
-        .info-item value {
-            display: block;
-            font-size: 16px;
-            color: #333;
-            font-weight: 500;
-        }
-        .badge {
-            display: inline-block;
-            padding: 4px 10px;
-            border-radius: 20px;
-            font-size: 12px;
-            font-weight: bold;
-        }
-        .badge.connected { background: #48bb78; color: white; }
-        .badge.disconnected { background: #f56565; color: white; }
-        .badge.subscribed { background: #4299e1; color: white; }
-        .badge.pending { background: #ed8936; color: white; }
-        .message {
-            padding: 12px;
-            margin: 8px 0;
-            font-size: 13px;
-            border-left: 4px solid #ddd;
-            background: #f9f9f9;
-            border-radius: 4px;
-        }
-        .message.from-manager { border-left-color: #667eea; }
-        .message.from-worker { border-left-color: #48bb78; }
-        .message-meta {
-            font-size: 11px;
-            color: #999;
-            margin-bottom: 5px;
-        }
-        .message-text {
-            color: #333;
-            word-wrap: break-word;
-        }
-        .btn {
-            display: inline-block;
-            padding: 10px 20px;
-            background: #667eea;
-            color: white;
-            text-decoration: none;
-            border-radius: 5px;
-            font-size: 14px;
-            border: none;
-            cursor: pointer;
-            margin-right: 10px;
-            margin-bottom: 10px;
-        }
-        .btn:hover { background: #5568d3; }
-        .btn.danger { background: #f56565; }
-        .btn.danger:hover { background: #e53e3e; }
-        .btn.secondary { background: #718096; }
-        .btn.secondary:hover { background: #4a5568; }
-        .empty-state {
-            text-align: center;
-            padding: 40px;
-            color: #999;
-        }
-        .collapsible-header {
-            cursor: pointer;
-            user-select: none;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        .collapsible-header:hover {
-            color: #667eea;
-        }
-        .collapsible-content {
-            max-height: 0;
-            overflow: hidden;
-            transition: max-height 0.3s ease;
-        }
-        .collapsible-content.expanded {
-            max-height: 10000px;
-        }
-        .toggle-icon {
-            font-size: 20px;
-            transition: transform 0.3s ease;
-        }
-        .toggle-icon.expanded {
-            transform: rotate(180deg);
-        }
-        .filter-buttons {
-            margin-bottom: 20px;
-        }
-        .filter-btn {
-            display: inline-block;
-            padding: 8px 16px;
-            background: #e2e8f0;
-            color: #333;
-            border: none;
-            border-radius: 5px;
-            font-size: 13px;
-            cursor: pointer;
-            margin-right: 10px;
-            margin-bottom: 10px;
-        }
-        .filter-btn:hover { background: #cbd5e0; }
-        .filter-btn.active { background: #667eea; color: white; }
-        .message-count {
-            font-size: 14px;
-            color: #666;
-            margin-bottom: 15px;
-        }
-        .workers-list {
-            margin: 15px 0;
-            padding: 15px;
-            background: #f0f0f0;
-            border-radius: 5px;
-        }
-        .worker-item {
-            padding: 8px 0;
-            font-size: 14px;
-            border-bottom: 1px solid #ddd;
-        }
-        .worker-item:last-child {
-            border-bottom: none;
-        }
-        .worker-selector {
-            margin: 20px 0;
-        }
-        .worker-tab {
-            display: inline-block;
-            padding: 10px 20px;
-            margin-right: 10px;
-            background: #e2e8f0;
-            border-radius: 5px;
-            cursor: pointer;
-            font-size: 14px;
-        }
-        .worker-tab:hover {
-            background: #cbd5e0;
-        }
-        .worker-tab.active {
-            background: #667eea;
-            color: white;
-        }
-        .worker-section {
-            display: none;
-        }
-        .worker-section.active {
-            display: block;
-        }
-    </style>
-    <script>
-        function toggleCollapsible(id) {
-            const content = document.getElementById(id);
-            const icon = document.getElementById(id + '-icon');
-            content.classList.toggle('expanded');
-            icon.classList.toggle('expanded');
-        }
-        
-        function filterMessages(hours) {
-            // This is a placeholder for future filtering functionality
-            // For now, we'll reload the page with a query parameter
-            window.location.href = '/manager/{{ manager.id }}?hours=' + hours;
-        }
-        
-        function showWorkerSection(workerId) {
-            // Hide all worker sections
-            document.querySelectorAll('.worker-section').forEach(section => {
-                section.classList.remove('active');
-            });
-            
-            // Remove active class from all tabs
-            document.querySelectorAll('.worker-tab').forEach(tab => {
-                tab.classList.remove('active');
-            });
-            
-            // Show selected worker section
-            const section = document.getElementById('worker-' + workerId);
-            if (section) {
-                section.classList.add('active');
-            }
-            
-            // Mark selected tab as active
-            const tab = document.getElementById('tab-' + workerId);
-            if (tab) {
-                tab.classList.add('active');
-            }
-        }
-        
-        // Show first worker by default on page load
-        window.addEventListener('DOMContentLoaded', function() {
-            const firstTab = document.querySelector('.worker-tab');
-            if (firstTab) {
-                firstTab.click();
-            }
-        });
-    </script>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <div class="header-left">
-                <h1>ðŸ‘¤ Manager Details</h1>
-                <p>Manager ID: {{ manager.id }}</p>
-            </div>
-            <div class="header-right">
-                <a href="/" class="back-btn">â† Back to Dashboard</a>
-                <a href="/logout" class="logout">ðŸšª Logout</a>
-            </div>
-        </div>
-
-        <!-- Section 1: Manager Info -->
-        <div class="section">
-            <h2>ðŸ“‹ Manager Information</h2>
-            <div class="info-grid">
-                <div class="info-item">
-                    <label>Manager ID</label>
-                    <value>{{ manager.id }}</value>
-                </div>
-                <div class="info-item">
-                    <label>Invitation Code</label>
-                    <value>{{ manager.code }}</value>
-                </div>
-                <div class="info-item">
-                    <label>Language</label>
-                    <value>{{ manager.language }}</value>
-                </div>
-                <div class="info-item">
-                    <label>Gender</label>
-                    <value>{{ manager.gender }}</value>
-                </div>
-                <div class="info-item">
-                    <label>Industry</label>
-                    <value>{{ manager.industry }}</value>
-                </div>
-            </div>
-        </div>
-
-        <!-- Section 2: Connection & Subscription -->
-        <div class="section">
-            <h2>ðŸ”— Connection & Subscription</h2>
-            <div class="info-grid">
-                <div class="info-item">
-                    <label>Workers Status</label>
-                    <value>
-                        {% if workers_list %}
-                            {{ workers_list|length }} Connected
-                        {% else %}
-                            <span class="badge disconnected">âŒ No Workers</span>
-                        {% endif %}
-                    </value>
-                </div>
-                <div class="info-item">
-                    <label>Messages Sent</label>
-                    <value>
-                        {% if manager.subscription %}
-                            Unlimited
-                        {% else %}
-                            {{ manager.messages_sent }} / {{ manager.message_limit }}
-                            {% if manager.blocked %}
-                                <span class="badge disconnected">ðŸš« Blocked</span>
-                            {% endif %}
-                        {% endif %}
-                    </value>
-                </div>
-                <div class="info-item">
-                    <label>Subscription</label>
-                    <value>
-                        {% if manager.subscription %}
-                            <span class="badge subscribed">ðŸ’³ {{ manager.subscription.status|title }}</span>
-                        {% else %}
-                            <span class="badge disconnected">Free Tier</span>
-                        {% endif %}
-                    </value>
-                </div>
-                {% if manager.subscription and manager.subscription.renews_at %}
-                <div class="info-item">
-                    <label>Renews At</label>
-                    <value>{{ manager.subscription.renews_at[:10] }}</value>
-                </div>
-                {% endif %}
-            </div>
-            
-            <!-- âœ… NEW: Workers List -->
-            {% if workers_list or pending_bots %}
-            <div style="margin-top: 20px;">
-                <label style="font-size: 14px; color: #666; text-transform: uppercase; margin-bottom: 10px; display: block;">
-                    Workers ({{ workers_list|length }} connected{% if pending_bots %}, {{ pending_bots|length }} pending{% endif %})
-                </label>
-                <div class="workers-list">
-                    {% for worker in workers_list %}
-                    <div class="worker-item">
-                        <strong>Bot {{ worker.bot_id|upper }}:</strong> 
-                        Worker {{ worker.worker_id }} 
-                        <span class="badge connected">{{ worker.status|title }}</span>
-                        <br>
-                        <small style="color: #666;">Language: {{ worker.language }}, Gender: {{ worker.gender }}</small>
-                    </div>
-                    {% endfor %}
-                    
-                    {% for bot_id in pending_bots %}
-                    <div class="worker-item">
-                        <strong>Bot {{ bot_id|upper }}:</strong> 
-                        <span class="badge pending">â³ Pending Invitation</span>
-                    </div>
-                    {% endfor %}
-                </div>
-            </div>
-            {% endif %}
-            
-            {% if manager.subscription and manager.subscription.customer_portal_url %}
-            <div style="margin-top: 15px;">
-                <a href="{{ manager.subscription.customer_portal_url }}" target="_blank" class="btn">ðŸ”— Customer Portal</a>
-            </div>
-            {% endif %}
-        </div>
-
-        <!-- Section 3: Translation Context (Per Worker) -->
-        <div class="section">
-            <h2>ðŸ’¬ Translation Context (Last 6 Messages Per Worker)</h2>
-            <p style="font-size: 13px; color: #666; margin-bottom: 15px;">
-                These are the messages the bot uses for contextual translation.
-            </p>
-            
-            {% if workers_list %}
-                <!-- Worker Tabs -->
-                <div class="worker-selector">
-                    {% for worker in workers_list %}
-                    <div class="worker-tab" id="tab-{{ worker.worker_id }}" onclick="showWorkerSection('{{ worker.worker_id }}')">
-                        Bot {{ worker.bot_id|upper }} - Worker {{ worker.worker_id }}
-                    </div>
-                    {% endfor %}
-                </div>
-                
-                <!-- Worker Sections -->
-                {% for worker in workers_list %}
-                <div class="worker-section" id="worker-{{ worker.worker_id }}">
-                    {% if worker.translation_context %}
-                        {% for msg in worker.translation_context %}
-                        <div class="message {{ 'from-manager' if msg.is_manager else 'from-worker' }}">
-                            <div class="message-meta">
-                                <strong>{{ msg.from_role }}</strong> â€¢ {{ msg.time }} â€¢ {{ msg.lang }}
-                            </div>
-                            <div class="message-text">{{ msg.text }}</div>
-                        </div>
-                        {% endfor %}
-                    {% else %}
-                        <div class="empty-state">
-                            <p>No translation context available yet for this worker.</p>
-                        </div>
-                    {% endif %}
-                </div>
-                {% endfor %}
-            {% else %}
-                <div class="empty-state">
-                    <p>No workers connected yet.</p>
-                    <p style="font-size: 12px; margin-top: 10px;">Messages will appear here once the manager connects workers.</p>
-                </div>
-            {% endif %}
-        </div>
-
-        <!-- Section 4: Full Message History (Per Worker) -->
-        <div class="section">
-            <div class="collapsible-header" onclick="toggleCollapsible('full-history')">
-                <h2>ðŸ“œ Full Message History ({{ total_message_count }} messages total)</h2>
-                <span class="toggle-icon" id="full-history-icon">â–¼</span>
-            </div>
-            <div id="full-history" class="collapsible-content">
-                <p style="font-size: 13px; color: #666; margin-bottom: 15px; margin-top: 15px;">
-                    Complete conversation history (last 30 days).
-                </p>
-                
-                {% if workers_list %}
-                    <!-- Worker Tabs -->
-                    <div class="worker-selector">
-                        {% for worker in workers_list %}
-                        <div class="worker-tab" onclick="showWorkerSection('history-{{ worker.worker_id }}')">
-                            Bot {{ worker.bot_id|upper }} ({{ worker.message_count }} msgs)
-                        </div>
-                        {% endfor %}
-                    </div>
-                    
-                    <!-- Worker History Sections -->
-                    {% for worker in workers_list %}
-                    <div class="worker-section" id="history-{{ worker.worker_id }}">
-                        {% if worker.full_history %}
-                            <div class="message-count">Showing {{ worker.full_history|length }} messages</div>
-                            {% for msg in worker.full_history %}
-                            <div class="message {{ 'from-manager' if msg.is_manager else 'from-worker' }}">
-                                <div class="message-meta">
-                                    <strong>{{ msg.from_role }}</strong> â€¢ {{ msg.timestamp }} â€¢ {{ msg.lang }}
-                                </div>
-                                <div class="message-text">{{ msg.text }}</div>
-                            </div>
-                            {% endfor %}
-                        {% else %}
-                            <div class="empty-state">
-                                <p>No message history available yet for this worker.</p>
-                            </div>
-                        {% endif %}
-                    </div>
-                    {% endfor %}
-                {% else %}
-                    <div class="empty-state">
-                        <p>No message history available yet.</p>
-                        <p style="font-size: 12px; margin-top: 10px;">Messages are stored for 30 days and will appear here.</p>
-                    </div>
-                {% endif %}
-            </div>
-        </div>
-
-        <!-- Section 5: Admin Actions -->
-        <div class="section">
-            <h2>âš™ï¸ Admin Actions</h2>
-            <p style="font-size: 13px; color: #666; margin-bottom: 20px;">
-                Manage this manager's account and data.
-            </p>
-            
-            {% if manager.blocked %}
-            <form method="POST" action="/reset_usage/{{ manager.id }}" style="display:inline;">
-                <input type="hidden" name="csrf_token" value="{{ csrf_token() }}">
-                <button type="submit" class="btn">ðŸ”“ Reset Usage Limit</button>
-            </form>
-            {% endif %}
-            
-            {% if workers_list %}
-                {% for worker in workers_list %}
-                <form method="POST" action="/clear_translation_context/{{ manager.id }}/{{ worker.connection_id }}" style="display:inline;"
-                      onsubmit="return confirm('Clear translation context for Bot {{ worker.bot_id|upper }}?');">
-                    <input type="hidden" name="csrf_token" value="{{ csrf_token() }}">
-                    <button type="submit" class="btn secondary">ðŸ§¹ Clear Context (Bot {{ worker.bot_id|upper }})</button>
-                </form>
-                
-                <form method="POST" action="/clear_full_history/{{ manager.id }}/{{ worker.connection_id }}" style="display:inline;"
-                      onsubmit="return confirm('Clear full history for Bot {{ worker.bot_id|upper }}?');">
-                    <input type="hidden" name="csrf_token" value="{{ csrf_token() }}">
-                    <button type="submit" class="btn secondary">ðŸ—‘ï¸ Clear History (Bot {{ worker.bot_id|upper }})</button>
-                </form>
-                {% endfor %}
-            {% endif %}
-            
-            <form method="POST" action="/delete_user/{{ manager.id }}" style="display:inline;" 
-                  onsubmit="return confirm('Delete this manager and ALL their data? This cannot be undone!');">
-                <input type="hidden" name="csrf_token" value="{{ csrf_token() }}">
-                <button type="submit" class="btn danger">âŒ Delete Manager Account</button>
-            </form>
-        </div>
-    </div>
-</body>
-</html>
-"""
+
+HISTORY_PAGE_SIZE = 50  # messages per "Full Message History" fetch
+
+# Rendered manager pages, reused while get_detail_version() is unchanged
+DETAIL_CACHE_SIZE = 256
+_DETAIL_CACHE = OrderedDict()
+_DETAIL_CACHE_LOCK = threading.Lock()
 
 
 @app.route("/manager/<int:user_id>")
+@admin_required
 def manager_detail(user_id):
-    if not session.get("authenticated"):
-        return redirect("/login")
-
-    mgr = manager_model.get_by_id(user_id)
-    if not mgr:
-        return redirect("/")
-    user = user_model.get_by_id(user_id)
-    if not user:
+    version = manager_model.get_detail_version(user_id)
+    if version is None:
         return redirect("/")
-
+    # The page embeds the session's CSRF token, so it is part of the key
+    version += (generate_csrf_token(),)
+    etag = hashlib.blake2b(repr(version).encode(), digest_size=16).hexdigest()
+    # The ETag is set strong; gzip_response weakens it on compressed responses,
+    # so the browser may send it back as W/"..." and the match is weak
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        with _DETAIL_CACHE_LOCK:
+            cached = _DETAIL_CACHE.get(user_id)
+            html = cached[1] if cached and cached[0] == version else None
+            if html is not None:
+                _DETAIL_CACHE.move_to_end(user_id)
+        if html is not None:
+            response = Response(html, mimetype="text/html")
+        else:
+            stream = _stream_manager_detail(user_id, version)
+            response = Response(stream_with_context(_cache_as_streamed(user_id, version, stream)),
+                                mimetype="text/html")
+    # Let the browser keep the page but revalidate it on every visit
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _cache_as_streamed(user_id, version, stream):
+    """Pass the rendered page through to the client, caching it once complete"""
+    parts = []
+    for chunk in stream:
+        parts.append(chunk)
+        yield chunk
+    with _DETAIL_CACHE_LOCK:
+        _DETAIL_CACHE[user_id] = (version, "".join(parts))
+        _DETAIL_CACHE.move_to_end(user_id)
+        while len(_DETAIL_CACHE) > DETAIL_CACHE_SIZE:
+            _DETAIL_CACHE.popitem(last=False)
+
+
+# Plain-text fields pre-marked safe so autoescape skips them; message text is still escaped
+_ROLE_MANAGER = Markup('Manager')
+_ROLE_WORKER = Markup('Worker')
+
+
+def _stream_manager_detail(user_id, version):
+    # The version row already carries the profile, usage and subscription
+    # columns, so those lookups don't need their own queries.
+    (language, gender, code, industry, messages_sent, is_blocked,
+     sub_status, renews_at, ends_at, portal_url) = version[:10]
     config = load_config()
     message_limit = config.get("free_message_limit", 50)
     manager = {
-        'id': user_id, 'code': mgr['code'], 'language': user['language'],
-        'gender': user.get('gender', 'N/A'), 'industry': mgr['industry'],
+        'id': user_id, 'code': code, 'language': language,
+        'gender': gender, 'industry': industry,
         'message_limit': message_limit,
     }
 
-    usage = usage_model.get(user_id)
-    manager['messages_sent'] = usage['messages_sent'] if usage else 0
-    subscription = subscription_model.get_by_manager(user_id)
+    manager['messages_sent'] = messages_sent or 0
+    subscription = None if sub_status is None else {
+        'status': sub_status, 'renews_at': renews_at,
+        'ends_at': ends_at, 'customer_portal_url': portal_url,
+    }
     manager['subscription'] = subscription
-    if subscription and subscription.get('status') in ['active', 'cancelled']:
+    if subscription and subscription.get('status') in _ACTIVE_SUB_STATUSES:
         manager['blocked'] = False
     else:
-        manager['blocked'] = usage.get('is_blocked', False) if usage else False
+        manager['blocked'] = bool(is_blocked)
 
-    connections = connection_model.get_active_for_manager(user_id)
+    connections = connection_model.get_active_workers_for_manager(user_id)
     pending_bots = []
     workers_list = []
     total_message_count = 0
 
+    str_user_id = str(user_id)
+    conn_ids = [c['connection_id'] for c in connections]
+    contexts, message_counts = message_model.get_contexts_and_counts(conn_ids, limit=6)
+
     for conn in connections:
-        worker_user = user_model.get_by_id(conn['worker_id'])
-        if not worker_user:
-            continue
         worker_data = {
             'worker_id': conn['worker_id'], 'bot_id': f"bot{conn['bot_slot']}",
-            'status': 'active', 'language': worker_user.get('language', 'Unknown'),
-            'gender': worker_user.get('gender', 'N/A'), 'connection_id': conn['connection_id'],
+            'bot_label': f"BOT{conn['bot_slot']}",
+            'status': 'active', 'language': conn['language'],
+            'gender': conn['gender'], 'connection_id': conn['connection_id'],
         }
 
         # Translation context (last 6 messages)
-        context_messages = message_model.get_translation_context(conn['connection_id'], limit=6)
-        translation_context = []
-        for msg in context_messages:
-            is_manager = str(msg['from']) == str(user_id)
-            sent_at = msg.get('timestamp')
-            time_str = ''
-            if sent_at:
-                try:
-                    dt = datetime.fromisoformat(sent_at) if isinstance(sent_at, str) else sent_at
-                    time_str = dt.strftime("%Y-%m-%d %H:%M")
-                except (ValueError, AttributeError):
-                    time_str = str(sent_at)
-            translation_context.append({
-                'time': time_str, 'text': msg['text'], 'lang': '',
-                'is_manager': is_manager, 'from_role': 'Manager' if is_manager else 'Worker',
-            })
-        worker_data['translation_context'] = translation_context
-
-        # Full message history
-        all_messages = message_model.get_for_connection(conn['connection_id'])
-        worker_data['message_count'] = len(all_messages)
-        total_message_count += len(all_messages)
-        full_history = []
-        for msg in all_messages:
-            is_manager = msg['sender_id'] == user_id
-            sent_at = msg.get('sent_at')
-            time_str = sent_at.strftime("%Y-%m-%d %H:%M:%S") if sent_at else ''
-            full_history.append({
-                'timestamp': time_str, 'text': msg['original_text'], 'lang': '',
-                'is_manager': is_manager, 'from_role': 'Manager' if is_manager else 'Worker',
-            })
-        worker_data['full_history'] = full_history
+        worker_data['translation_context'] = [
+            {'time': Markup(msg['time_str']), 'text': msg['text'], 'lang': '',
+             'is_manager': (is_manager := msg['from'] == str_user_id),
+             'from_role': _ROLE_MANAGER if is_manager else _ROLE_WORKER,
+             'css_class': 'from-manager' if is_manager else 'from-worker'}
+            for msg in contexts.get(conn['connection_id'], [])
+        ]
+
+        # Full message history is paged in by the browser; only counts here
+        worker_data['message_count'] = message_counts.get(conn['connection_id'], 0)
+        total_message_count += worker_data['message_count']
         workers_list.append(worker_data)
 
-    return render_template_string(
-        MANAGER_DETAIL_HTML, manager=manager, workers_list=workers_list,
+    stream = app.jinja_env.get_template("manager_detail.html").stream(
+        manager=manager, workers_list=workers_list,
         pending_bots=pending_bots, total_message_count=total_message_count,
+        csrf_input=csrf_hidden_input(),
     )
+    stream.enable_buffering(5)
+    return stream
+
+@app.route("/manager/<int:user_id>/history/<int:connection_id>")
+def manager_history(user_id, connection_id):
+    """One page of a connection's full message history, as JSON"""
+    if not session.get("authenticated"):
+        return jsonify({"error": "Not authenticated"}), 401
+    conn = connection_model.get_by_id(connection_id)
+    if not conn or conn['manager_id'] != user_id:
+        abort(404)
+
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    # Fetch one extra row to know whether another page exists
+    rows = message_model.get_history_page(connection_id, limit=HISTORY_PAGE_SIZE + 1, offset=offset)
+    page = rows[:HISTORY_PAGE_SIZE]
+    messages = [
+        {'timestamp': sent_at_str, 'text': text, 'is_manager': sender_id == user_id}
+        for sent_at_str, sender_id, text in page
+    ]
+    next_offset = offset + len(page) if len(rows) > HISTORY_PAGE_SIZE else None
+    return jsonify({"messages": messages, "next_offset": next_offset})
 
 @app.route("/clear_translation_context/<int:user_id>/<int:connection_id>", methods=["POST"])
+@admin_required
+@csrf_required
 def clear_translation_context_route(user_id, connection_id):
     """Clear translation context for a specific connection"""
-    if not session.get("authenticated"):
-        return redirect("/login")
-    csrf_token = request.form.get('csrf_token')
-    if not verify_csrf_token(csrf_token):
-        return "Invalid CSRF token", 403
-    if not manager_model.get_by_id(user_id):
+    if not manager_model.exists(user_id):
         return redirect("/")
     message_model.delete_for_connection(connection_id)
+    invalidate_dashboard_cache()
+    with _DETAIL_CACHE_LOCK:
+        _DETAIL_CACHE.pop(user_id, None)
     return redirect(f"/manager/{user_id}")
 
 @app.route("/clear_full_history/<int:user_id>/<int:connection_id>", methods=["POST"])
+@admin_required
+@csrf_required
 def clear_full_history_route(user_id, connection_id):
     """Clear full message history for a specific connection"""
-    if not session.get("authenticated"):
-        return redirect("/login")
-    csrf_token = request.form.get('csrf_token')
-    if not verify_csrf_token(csrf_token):
-        return "Invalid CSRF token", 403
-    if not manager_model.get_by_id(user_id):
+    if not manager_model.exists(user_id):
         return redirect("/")
     message_model.delete_for_connection(connection_id)
+    invalidate_dashboard_cache()
+    with _DETAIL_CACHE_LOCK:
+        _DETAIL_CACHE.pop(user_id, None)
     return redirect(f"/manager/{user_id}")
 
 
@@ -0,0 +1,37 @@
+"""
+Gunicorn settings for the dashboard web service.
+
+Start command (Railway web service):
+    gunicorn -c gunicorn.conf.py dashboard:app
+
+The bot runs as its own service (python bot.py); only the Flask app runs here.
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+# One process by default: the dashboard and conversations caches, the message
+# total and invalidate_dashboard_cache() are per process. With more workers, the
+# GET that follows an admin action can land on a worker that still serves the
+# pre-change data for up to DASH_TTL seconds. Threads give the concurrency.
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+worker_class = "gthread"
+threads = 4
+timeout = 30
+
+# dashboard.py creates the session secret key and compiles its templates at
+# import time. Loading the app before forking gives every worker the same
+# secret key, so a login on one worker is valid on the others.
+preload_app = True
+
+
+def post_fork(server, worker):
+    # psycopg2 connections can't be shared between processes, so each worker
+    # opens its own pool, one connection per thread. With the defaults that is
+    # 1 x 4 = 4 connections, leaving room for the bot under Railway's limit of 20.
+    from utils.db_connection import init_connection_pool
+    init_connection_pool(min_conn=1, max_conn=threads)
+
+
+def worker_exit(server, worker):
+    from utils.db_connection import close_all_connections
+    close_all_connections()
@@ -84,6 +84,33 @@ def disconnect(connection_id: int) -> Optional[Dict]:
     }
 
 
+def disconnect_all_for_manager(manager_id: int) -> List[Dict]:
+    """
+    Disconnect every active connection of a manager in one statement.
+    Returns the disconnected connections (connection_id, worker_id, bot_slot).
+    """
+    with get_db_cursor() as cur:
+        cur.execute("""
+            UPDATE connections
+            SET status = 'disconnected', disconnected_at = NOW()
+            WHERE manager_id = %s AND status = 'active'
+            RETURNING connection_id, worker_id, bot_slot
+        """, (manager_id,))
+        rows = cur.fetchall()
+
+    if rows:
+        logger.info(f"Connections disconnected for manager={manager_id}: "
+                    f"ids={[r[0] for r in rows]}")
+    return [
+        {
+            'connection_id': r[0],
+            'worker_id': r[1],
+            'bot_slot': r[2],
+        }
+        for r in rows
+    ]
+
+
 def get_by_id(connection_id: int) -> Optional[Dict]:
     """Get connection by ID (any status)."""
     with get_db_cursor(commit=False) as cur:
@@ -156,6 +183,40 @@ def get_active_for_manager(manager_id: int) -> List[Dict]:
     ]
 
 
+def get_active_workers_for_manager(manager_id: int) -> List[Dict]:
+    """
+    Active connections for a manager with just the worker fields the dashboard
+    shows (language, gender), joined in one query. Ordered by bot slot.
+    """
+    with get_db_cursor(commit=False) as cur:
+        cur.execute(
+            "SELECT c.connection_id, c.worker_id, c.bot_slot, u.language, u.gender "
+            "FROM connections c JOIN users u ON u.user_id = c.worker_id "
+            "WHERE c.manager_id = %s AND c.status = 'active' "
+            "ORDER BY c.bot_slot",
+            (manager_id,)
+        )
+        rows = cur.fetchall()
+
+    return [
+        {
+            'connection_id': r[0],
+            'worker_id': r[1],
+            'bot_slot': r[2],
+            'language': r[3],
+            'gender': r[4],
+        }
+        for r in rows
+    ]
+
+
+def count_active() -> int:
+    """Count all active connections (dashboard stats)."""
+    with get_db_cursor(commit=False) as cur:
+        cur.execute("SELECT COUNT(*) FROM connections WHERE status = 'active'")
+        return cur.fetchone()[0]
+
+
 def get_active_for_worker(worker_id: int) -> Optional[Dict]:
     """Get the active connection for a worker (workers can only have one)."""
     with get_db_cursor(commit=False) as cur:
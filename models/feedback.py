@@ -20,10 +20,14 @@ def save(user_id: int, telegram_name: str = None, username: str = None, message:
 
 
 def get_all(limit: int = 100) -> List[Dict]:
-    """Get all feedback ordered by newest first (for dashboard)."""
+    """
+    Get all feedback ordered by newest first (for dashboard).
+    'created_at_str' is the display time (YYYY-MM-DD HH:MM) formatted in SQL.
+    """
     with get_db_cursor(commit=False) as cur:
         cur.execute("""
-            SELECT feedback_id, user_id, telegram_name, username, message, created_at, status
+            SELECT feedback_id, user_id, telegram_name, username, message, created_at, status,
+                   to_char(created_at, 'YYYY-MM-DD HH24:MI') AS created_at_str
             FROM feedback
             ORDER BY created_at DESC
             LIMIT %s
@@ -39,6 +43,7 @@ def get_all(limit: int = 100) -> List[Dict]:
             'message': r[4],
             'created_at': r[5],
             'status': r[6],
+            'created_at_str': r[7],
         }
         for r in rows
     ]
@@ -3,7 +3,7 @@ Manager model — manager-specific data and role detection.
 """
 import logging
 from typing import Optional, Dict
-from utils.db_connection import get_db_cursor
+from utils.db_connection import get_db_cursor, execute_prepared
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +29,16 @@ def get_by_id(manager_id: int) -> Optional[Dict]:
     }
 
 
+def exists(manager_id: int) -> bool:
+    """Check whether an active (not soft-deleted) manager exists."""
+    with get_db_cursor(commit=False) as cur:
+        cur.execute(
+            "SELECT 1 FROM managers WHERE manager_id = %s AND deleted_at IS NULL",
+            (manager_id,)
+        )
+        return cur.fetchone() is not None
+
+
 def get_by_code(code: str) -> Optional[Dict]:
     """Find active manager by invitation code (e.g. 'BRIDGE-12345')."""
     with get_db_cursor(commit=False) as cur:
@@ -119,7 +129,8 @@ def get_all_active() -> list:
     """Get all active managers (for dashboard)."""
     with get_db_cursor(commit=False) as cur:
         cur.execute(
-            "SELECT m.manager_id, m.code, m.industry, m.created_at, u.telegram_name, u.language "
+            "SELECT m.manager_id, m.code, m.industry, m.created_at, u.telegram_name, u.language, "
+            "u.gender "
             "FROM managers m JOIN users u ON m.manager_id = u.user_id "
             "WHERE m.deleted_at IS NULL "
             "ORDER BY m.created_at DESC"
@@ -134,6 +145,47 @@ def get_all_active() -> list:
             'created_at': r[3],
             'telegram_name': r[4],
             'language': r[5],
+            'gender': r[6],
         }
         for r in rows
     ]
+
+
+def get_detail_version(manager_id: int) -> Optional[tuple]:
+    """
+    Cheap fingerprint of everything the dashboard manager page shows, in one query.
+    Changes whenever a message is added or deleted, a worker (dis)connects, or the
+    manager's profile, usage or subscription changes. None if no active manager.
+    The row doubles as the page's data: (language, gender, code, industry,
+    messages_sent, is_blocked, sub status, renews_at 'YYYY-MM-DD', ends_at,
+    portal url, connection ids, worker profiles, message total, last message id).
+    """
+    with get_db_cursor(commit=False) as cur:
+        execute_prepared(cur, "manager_detail_version", """
+            SELECT u.language, u.gender, m.code, m.industry,
+                   ut.messages_sent, ut.is_blocked,
+                   s.status, to_char(s.renews_at, 'YYYY-MM-DD'), s.ends_at, s.customer_portal_url,
+                   conn.ids, conn.profiles, msg.total, msg.last_id
+            FROM managers m
+            JOIN users u ON u.user_id = m.manager_id
+            LEFT JOIN usage_tracking ut ON ut.manager_id = m.manager_id
+            LEFT JOIN subscriptions s ON s.manager_id = m.manager_id
+            LEFT JOIN LATERAL (
+                SELECT array_agg(c.connection_id ORDER BY c.bot_slot) AS ids,
+                       array_agg(COALESCE(wu.language, '') || '|' || COALESCE(wu.gender, '')
+                                 ORDER BY c.bot_slot) AS profiles
+                FROM connections c JOIN users wu ON wu.user_id = c.worker_id
+                WHERE c.manager_id = m.manager_id AND c.status = 'active'
+            ) conn ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT COUNT(*) AS total, MAX(message_id) AS last_id
+                FROM messages WHERE connection_id = ANY(conn.ids)
+            ) msg ON TRUE
+            WHERE m.manager_id = $1 AND m.deleted_at IS NULL
+        """, (manager_id,))
+        row = cur.fetchone()
+
+    if not row:
+        return None
+
+    return tuple(tuple(v) if isinstance(v, list) else v for v in row)
@@ -5,13 +5,18 @@ Messages belong to connections, not directly to user pairs.
 """
 import logging
 import random
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from config import load_config
-from utils.db_connection import get_db_cursor
+from utils.db_connection import get_db_cursor, execute_prepared
 
 logger = logging.getLogger(__name__)
 
+# Dashboard stats don't need an exact live count; COUNT(*) scans the table
+TOTAL_COUNT_TTL = 60  # seconds
+_total_count_cache = {"t": 0.0, "count": None}
+
 
 def save(connection_id: int, sender_id: int, original_text: str, translated_text: str):
     """Save a translated message."""
@@ -115,28 +120,104 @@ def get_for_connection(connection_id: int, limit: int = 500) -> List[Dict]:
     ]
 
 
+def get_history_page(connection_id: int, limit: int, offset: int = 0) -> List[tuple]:
+    """
+    Lightweight page of a connection's history for the dashboard JSON endpoint.
+    Returns plain (sent_at_str, sender_id, original_text) tuples, oldest first.
+    """
+    with get_db_cursor(commit=False) as cur:
+        execute_prepared(cur, "message_history_page", """
+            SELECT COALESCE(to_char(sent_at, 'YYYY-MM-DD HH24:MI:SS'), ''),
+                   sender_id, original_text
+            FROM messages
+            WHERE connection_id = $1
+            ORDER BY sent_at ASC, message_id ASC
+            LIMIT $2 OFFSET $3
+        """, (connection_id, limit, offset))
+        return cur.fetchall()
+
+
+def get_contexts_and_counts(connection_ids: List[int], limit: int = 6) -> Tuple[Dict[int, List[Dict]], Dict[int, int]]:
+    """
+    Last N messages and message totals for several connections in one query
+    (dashboard detail page). Returns ({connection_id: [last N messages, oldest
+    first]}, {connection_id: total}); each message also carries a display-ready
+    'time_str' (YYYY-MM-DD HH:MM) formatted in SQL.
+    """
+    if not connection_ids:
+        return {}, {}
+
+    with get_db_cursor(commit=False) as cur:
+        cur.execute("""
+            SELECT connection_id, sender_id, original_text, translated_text, sent_at,
+                   COALESCE(to_char(sent_at, 'YYYY-MM-DD HH24:MI'), '') AS time_str, total
+            FROM (
+                SELECT connection_id, sender_id, original_text, translated_text, sent_at,
+                       ROW_NUMBER() OVER (PARTITION BY connection_id ORDER BY sent_at DESC) AS rn,
+                       COUNT(*) OVER (PARTITION BY connection_id) AS total
+                FROM messages
+                WHERE connection_id = ANY(%s)
+            ) recent
+            WHERE rn <= %s
+            ORDER BY connection_id, sent_at ASC
+        """, (list(connection_ids), limit))
+        rows = cur.fetchall()
+
+    by_connection = {}
+    counts = {}
+    for r in rows:
+        by_connection.setdefault(r[0], []).append({
+            'from': str(r[1]),
+            'text': r[2],
+            'translated_text': r[3],
+            'timestamp': r[4].isoformat() if r[4] else None,
+            'time_str': r[5],
+        })
+        counts[r[0]] = r[6]
+    return by_connection, counts
+
+
 def delete_for_connection(connection_id: int):
     """Delete all messages for a connection (admin action)."""
     with get_db_cursor() as cur:
         cur.execute("DELETE FROM messages WHERE connection_id = %s", (connection_id,))
         deleted = cur.rowcount
+    _total_count_cache["count"] = None
 
     if deleted > 0:
         logger.info(f"Deleted {deleted} messages for connection={connection_id}")
 
 
-def get_recent_across_connections(limit_per_connection: int = 10) -> List[Dict]:
+def get_recent_across_connections(limit_per_connection: int = 10, limit: Optional[int] = None,
+                                  offset: int = 0) -> List[Dict]:
     """
     Get recent messages across all active connections (for dashboard main page).
     Returns messages grouped by connection_id with manager/worker metadata.
+    Each message carries display-ready 'is_manager' and 'time_str' (HH:MM)
+    computed in SQL. limit/offset page through the connections that have messages,
+    most recently active first.
     """
     with get_db_cursor(commit=False) as cur:
         # Get last N messages per active connection using a lateral join
         cur.execute("""
             SELECT c.connection_id, c.manager_id, c.worker_id, c.bot_slot,
                    m.message_id, m.sender_id, m.original_text, m.translated_text, m.sent_at,
-                   mu.telegram_name as manager_name, wu.telegram_name as worker_name
-            FROM connections c
+                   mu.telegram_name as manager_name, wu.telegram_name as worker_name,
+                   (m.sender_id = c.manager_id) as is_manager,
+                   COALESCE(to_char(m.sent_at, 'HH24:MI'), '??:??') as time_str
+            FROM (
+                SELECT cn.connection_id, cn.manager_id, cn.worker_id, cn.bot_slot, last.sent_at AS last_sent_at
+                FROM connections cn
+                JOIN LATERAL (
+                    SELECT sent_at FROM messages
+                    WHERE messages.connection_id = cn.connection_id
+                    ORDER BY sent_at DESC
+                    LIMIT 1
+                ) last ON true
+                WHERE cn.status = 'active'
+                ORDER BY last.sent_at DESC, cn.connection_id
+                LIMIT %s OFFSET %s
+            ) c
             JOIN users mu ON c.manager_id = mu.user_id
             JOIN users wu ON c.worker_id = wu.user_id
             JOIN LATERAL (
@@ -146,9 +227,8 @@ def get_recent_across_connections(limit_per_connection: int = 10) -> List[Dict]:
                 ORDER BY sent_at DESC
                 LIMIT %s
             ) m ON true
-            WHERE c.status = 'active'
-            ORDER BY c.connection_id, m.sent_at ASC
-        """, (limit_per_connection,))
+            ORDER BY c.last_sent_at DESC, c.connection_id, m.sent_at ASC
+        """, (limit, offset, limit_per_connection))
         rows = cur.fetchall()
 
     # Group by connection
@@ -172,6 +252,8 @@ def get_recent_across_connections(limit_per_connection: int = 10) -> List[Dict]:
             'original_text': r[6],
             'translated_text': r[7],
             'sent_at': r[8],
+            'is_manager': r[11],
+            'time_str': r[12],
         })
 
     return list(connections.values())
@@ -184,6 +266,15 @@ def get_total_count() -> int:
         return cur.fetchone()[0]
 
 
+def get_total_count_cached() -> int:
+    """Total message count, refreshed at most every TOTAL_COUNT_TTL seconds."""
+    now = time.monotonic()
+    if _total_count_cache["count"] is None or now - _total_count_cache["t"] >= TOTAL_COUNT_TTL:
+        _total_count_cache["count"] = get_total_count()
+        _total_count_cache["t"] = now
+    return _total_count_cache["count"]
+
+
 def get_count(connection_id: int, hours: Optional[int] = None) -> int:
     """Get message count for a connection, optionally limited by time."""
     if hours:
@@ -2,7 +2,7 @@
 Subscription model — manager billing via LemonSqueezy.
 """
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from datetime import datetime, timezone
 from config import load_config
 from utils.db_connection import get_db_cursor
@@ -35,6 +35,34 @@ def get_by_manager(manager_id: int) -> Optional[Dict]:
     }
 
 
+def get_by_managers(manager_ids: List[int]) -> Dict[int, Dict]:
+    """Get subscriptions for many managers in one query. Returns {manager_id: subscription}."""
+    if not manager_ids:
+        return {}
+
+    with get_db_cursor(commit=False) as cur:
+        cur.execute("""
+            SELECT subscription_id, manager_id, external_id, status,
+                   customer_portal_url, renews_at, ends_at, created_at
+            FROM subscriptions WHERE manager_id = ANY(%s)
+        """, (list(manager_ids),))
+        rows = cur.fetchall()
+
+    return {
+        r[1]: {
+            'subscription_id': r[0],
+            'manager_id': r[1],
+            'external_id': r[2],
+            'status': r[3],
+            'customer_portal_url': r[4],
+            'renews_at': r[5],
+            'ends_at': r[6],
+            'created_at': r[7],
+        }
+        for r in rows
+    }
+
+
 def is_active(manager_id: int) -> bool:
     """
     Check if manager has active access.
@@ -110,11 +138,17 @@ def delete(manager_id: int):
 
 
 def get_all() -> list:
-    """Get all subscriptions (for dashboard)."""
+    """
+    Get all subscriptions (for dashboard).
+    The '*_str' keys are the display dates (YYYY-MM-DD) formatted in SQL.
+    """
     with get_db_cursor(commit=False) as cur:
         cur.execute("""
             SELECT s.subscription_id, s.manager_id, s.status, s.renews_at, s.ends_at,
-                   u.telegram_name
+                   u.telegram_name, s.created_at,
+                   to_char(s.created_at, 'YYYY-MM-DD') AS started_at_str,
+                   to_char(s.renews_at, 'YYYY-MM-DD') AS renews_at_str,
+                   to_char(s.ends_at, 'YYYY-MM-DD') AS ends_at_str
             FROM subscriptions s
             JOIN users u ON s.manager_id = u.user_id
             ORDER BY s.created_at DESC
@@ -129,6 +163,20 @@ def get_all() -> list:
             'renews_at': r[3],
             'ends_at': r[4],
             'telegram_name': r[5],
+            'created_at': r[6],
+            'started_at_str': r[7],
+            'renews_at_str': r[8],
+            'ends_at_str': r[9],
         }
         for r in rows
     ]
+
+
+def count_by_statuses(statuses) -> int:
+    """Count subscriptions whose status is in statuses (dashboard stat card)."""
+    with get_db_cursor(commit=False) as cur:
+        cur.execute(
+            "SELECT COUNT(*) FROM subscriptions WHERE status = ANY(%s)",
+            (list(statuses),)
+        )
+        return cur.fetchone()[0]
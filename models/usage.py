@@ -3,7 +3,7 @@ Usage model — message counting and free-tier limits.
 Tracks per-manager (not per-user) since billing is on the manager.
 """
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from config import load_config
 from utils.db_connection import get_db_cursor
 
@@ -32,6 +32,31 @@ def get(manager_id: int) -> Optional[Dict]:
     }
 
 
+def get_many(manager_ids: List[int]) -> Dict[int, Dict]:
+    """Get usage records for many managers in one query. Returns {manager_id: usage}."""
+    if not manager_ids:
+        return {}
+
+    with get_db_cursor(commit=False) as cur:
+        cur.execute(
+            "SELECT manager_id, messages_sent, is_blocked, first_message_at, last_message_at "
+            "FROM usage_tracking WHERE manager_id = ANY(%s)",
+            (list(manager_ids),)
+        )
+        rows = cur.fetchall()
+
+    return {
+        r[0]: {
+            'manager_id': r[0],
+            'messages_sent': r[1],
+            'is_blocked': r[2],
+            'first_message_at': r[3],
+            'last_message_at': r[4],
+        }
+        for r in rows
+    }
+
+
 def is_blocked(manager_id: int) -> bool:
     """Check if manager has reached message limit and is blocked."""
     config = load_config()
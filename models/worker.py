@@ -2,7 +2,7 @@
 Worker model — worker-specific data.
 """
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from utils.db_connection import get_db_cursor
 
 logger = logging.getLogger(__name__)
@@ -76,3 +76,18 @@ def soft_delete(worker_id: int):
         )
 
     logger.info(f"Worker soft-deleted: worker_id={worker_id}")
+
+
+def soft_delete_many(worker_ids: List[int]):
+    """Soft-delete several workers in one statement (preserves history)."""
+    if not worker_ids:
+        return
+
+    with get_db_cursor() as cur:
+        cur.execute(
+            "UPDATE workers SET deleted_at = NOW() "
+            "WHERE worker_id = ANY(%s) AND deleted_at IS NULL",
+            (list(worker_ids),)
+        )
+
+    logger.info(f"Workers soft-deleted: worker_ids={list(worker_ids)}")
@@ -171,6 +171,10 @@ CREATE TABLE feedback (
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
 );
 
+-- Dashboard: newest feedback first (ORDER BY created_at DESC LIMIT n)
+CREATE INDEX idx_feedback_created
+    ON feedback(created_at DESC);
+
 -- ============================================
 -- HELPER FUNCTION: auto-update updated_at
 -- ============================================
@@ -124,3 +124,6 @@ CREATE TABLE IF NOT EXISTS feedback (
     created_at     TIMESTAMPTZ DEFAULT NOW(),
     status         VARCHAR(20) DEFAULT 'unread'
 );
+
+CREATE INDEX IF NOT EXISTS idx_feedback_created
+    ON feedback (created_at DESC);
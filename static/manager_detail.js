@@ -0,0 +1,87 @@
+function toggleCollapsible(id) {
+    const content = document.getElementById(id);
+    const icon = document.getElementById(id + '-icon');
+    content.classList.toggle('expanded');
+    icon.classList.toggle('expanded');
+}
+
+function filterMessages(hours) {
+    // This is a placeholder for future filtering functionality
+    // For now, we'll reload the page with a query parameter
+    window.location.href = '/manager/' + document.body.dataset.managerId + '?hours=' + hours;
+}
+
+function showWorkerSection(workerId) {
+    // Hide all worker sections
+    document.querySelectorAll('.worker-section:not(.history-section)').forEach(section => {
+        section.classList.remove('active');
+    });
+    
+    // Remove active class from all tabs
+    document.querySelectorAll('.worker-tab:not(.history-tab)').forEach(tab => {
+        tab.classList.remove('active');
+    });
+    
+    // Show selected worker section
+    const section = document.getElementById('worker-' + workerId);
+    if (section) {
+        section.classList.add('active');
+    }
+    
+    // Mark selected tab as active
+    const tab = document.getElementById('tab-' + workerId);
+    if (tab) {
+        tab.classList.add('active');
+    }
+}
+
+function escapeHtml(value) {
+    const div = document.createElement('div');
+    div.textContent = value;
+    return div.innerHTML;
+}
+
+function showHistory(workerId) {
+    document.querySelectorAll('.history-section').forEach(section => {
+        section.classList.remove('active');
+    });
+    document.querySelectorAll('.history-tab').forEach(tab => {
+        tab.classList.remove('active');
+    });
+    const section = document.getElementById('history-' + workerId);
+    section.classList.add('active');
+    document.getElementById('history-tab-' + workerId).classList.add('active');
+    if (!section.dataset.loaded) {
+        section.dataset.loaded = '1';
+        loadHistory(workerId);
+    }
+}
+
+async function loadHistory(workerId) {
+    const section = document.getElementById('history-' + workerId);
+    const list = section.querySelector('.history-messages');
+    const more = section.querySelector('.history-more');
+    if (!list) return;  // no messages for this worker
+    more.disabled = true;
+    const resp = await fetch(section.dataset.url + '?offset=' + section.dataset.offset,
+                             { credentials: 'same-origin' });
+    if (!resp.ok) {
+        more.disabled = false;
+        return;
+    }
+    const page = await resp.json();
+    list.insertAdjacentHTML('beforeend', page.messages.map(msg => `
+        <div class="message ${msg.is_manager ? 'from-manager' : 'from-worker'}">
+            <div class="message-meta">
+                <strong>${msg.is_manager ? 'Manager' : 'Worker'}</strong> • ${escapeHtml(msg.timestamp)}
+            </div>
+            <div class="message-text">${escapeHtml(msg.text)}</div>
+        </div>`).join(''));
+    section.querySelector('.history-shown').textContent = list.children.length;
+    if (page.next_offset === null) {
+        more.remove();
+    } else {
+        section.dataset.offset = page.next_offset;
+        more.disabled = false;
+    }
+}
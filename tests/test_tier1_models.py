@@ -121,6 +121,25 @@ class TestManagerModel:
         make_worker(2001)
         assert manager_model.get_role(2001) == "worker"
 
+    def test_exists(self, make_manager, make_worker):
+        import models.manager as manager_model
+        make_manager(1001, code="BRIDGE-10001")
+        make_worker(2001)
+        assert manager_model.exists(1001) is True
+        assert manager_model.exists(2001) is False
+
+    def test_detail_version_tracks_messages(self, make_connection, make_worker):
+        import models.manager as manager_model
+        import models.message as message_model
+        _, _, conn = make_connection(1001, 2001, bot_slot=1)
+        before = manager_model.get_detail_version(1001)
+        message_model.save(conn["connection_id"], 1001, "hi", "hola")
+        after = manager_model.get_detail_version(1001)
+        assert before != after
+        assert manager_model.get_detail_version(1001) == after
+        make_worker(2002)
+        assert manager_model.get_detail_version(2002) is None
+
     def test_get_role_unregistered(self):
         import models.manager as manager_model
         assert manager_model.get_role(9999) is None
@@ -131,6 +150,13 @@ class TestManagerModel:
         make_manager(1002, name="Manager2", code="BRIDGE-10002")
         assert len(manager_model.get_all_active()) == 2
 
+    def test_get_all_active_includes_profile(self, make_manager):
+        import models.manager as manager_model
+        make_manager(1001, language="Hebrew", gender="Female", code="BRIDGE-10001")
+        mgr = manager_model.get_all_active()[0]
+        assert mgr["language"] == "Hebrew"
+        assert mgr["gender"] == "Female"
+
     def test_unique_code_constraint(self, make_manager):
         import models.manager as manager_model
         import models.user as user_model
@@ -156,6 +182,16 @@ class TestWorkerModel:
         worker_model.soft_delete(2001)
         assert worker_model.get_by_id(2001) is None
 
+    def test_soft_delete_many(self, make_worker):
+        import models.worker as worker_model
+        make_worker(2001)
+        make_worker(2002, name="W2")
+        make_worker(2003, name="W3")
+        worker_model.soft_delete_many([2001, 2002])
+        assert worker_model.get_by_id(2001) is None
+        assert worker_model.get_by_id(2002) is None
+        assert worker_model.get_by_id(2003) is not None
+
     def test_re_create_after_soft_delete(self, make_worker):
         import models.worker as worker_model
         make_worker(2001)
@@ -247,6 +283,38 @@ class TestConnectionModel:
         assert "manager_name" in all_c[0]
         assert "worker_name" in all_c[0]
 
+    def test_count_active(self, make_connection):
+        import models.connection as connection_model
+        assert connection_model.count_active() == 0
+        _, _, conn = make_connection(1001, 2001)
+        assert connection_model.count_active() == 1
+        connection_model.disconnect(conn["connection_id"])
+        assert connection_model.count_active() == 0
+
+    def test_disconnect_all_for_manager(self, make_manager, make_worker):
+        import models.connection as connection_model
+        make_manager(1001, code="BRIDGE-10001")
+        make_worker(2001)
+        make_worker(2002, name="W2")
+        connection_model.create(1001, 2001, 1)
+        connection_model.create(1001, 2002, 2)
+        disconnected = connection_model.disconnect_all_for_manager(1001)
+        assert sorted(c["worker_id"] for c in disconnected) == [2001, 2002]
+        assert connection_model.get_active_for_manager(1001) == []
+        assert connection_model.disconnect_all_for_manager(1001) == []
+
+    def test_get_active_workers_for_manager(self, make_manager, make_worker):
+        import models.connection as connection_model
+        make_manager(1001, code="BRIDGE-10001")
+        make_worker(2001, language="Spanish")
+        make_worker(2002, name="W2")
+        connection_model.create(1001, 2002, 2)
+        c1 = connection_model.create(1001, 2001, 1)
+        rows = connection_model.get_active_workers_for_manager(1001)
+        assert [r["bot_slot"] for r in rows] == [1, 2]
+        assert rows[0] == {"connection_id": c1, "worker_id": 2001, "bot_slot": 1,
+                           "language": "Spanish", "gender": "Female"}
+
 
 # ====================================================================
 # MESSAGE MODEL
@@ -314,6 +382,33 @@ class TestMessageModel:
         assert msgs[0]["original_text"] == "First"
         assert msgs[1]["sender_id"] == 2001
 
+    def test_get_history_page(self, make_connection):
+        import models.message as message_model
+        _, _, conn = make_connection(1001, 2001)
+        cid = conn["connection_id"]
+        for i in range(4):
+            message_model.save(cid, 1001 if i % 2 == 0 else 2001, f"msg{i}", f"t{i}")
+        page = message_model.get_history_page(cid, limit=2, offset=1)
+        assert [(sender, text) for _, sender, text in page] == [(2001, "msg1"), (1001, "msg2")]
+        assert len(page[0][0]) == len("YYYY-MM-DD HH:MM:SS")
+
+    def test_get_contexts_and_counts(self, make_connection, make_worker):
+        import models.message as message_model
+        import models.connection as connection_model
+        _, _, conn = make_connection(1001, 2001, bot_slot=1)
+        make_worker(2002, name="W2")
+        c1 = conn["connection_id"]
+        c2 = connection_model.create(1001, 2002, 2)
+        for i in range(4):
+            message_model.save(c1, 1001, f"m{i}", f"t{i}")
+        contexts, counts = message_model.get_contexts_and_counts([c1, c2], limit=2)
+        assert [m["text"] for m in contexts[c1]] == ["m2", "m3"]
+        assert counts == {c1: 4}
+        assert c2 not in contexts
+        assert contexts[c1][0]["from"] == "1001"
+        assert contexts[c1][0]["time_str"] == datetime.fromisoformat(
+            contexts[c1][0]["timestamp"]).strftime("%Y-%m-%d %H:%M")
+
     def test_get_total_count(self, make_connection):
         import models.message as message_model
         _, _, conn = make_connection(1001, 2001)
@@ -325,6 +420,18 @@ class TestMessageModel:
         import models.message as message_model
         assert message_model.get_total_count() == 0
 
+    def test_get_total_count_cached(self, make_connection):
+        import models.message as message_model
+        _, _, conn = make_connection(1001, 2001)
+        cid = conn["connection_id"]
+        message_model._total_count_cache["count"] = None
+        message_model.save(cid, 1001, "a", "b")
+        assert message_model.get_total_count_cached() == 1
+        message_model.save(cid, 2001, "c", "d")
+        assert message_model.get_total_count_cached() == 1  # served from cache
+        message_model.delete_for_connection(cid)
+        assert message_model.get_total_count_cached() == 0  # delete invalidates
+
     def test_delete_for_connection(self, make_connection):
         import models.message as message_model
         _, _, conn = make_connection(1001, 2001)
@@ -350,6 +457,33 @@ class TestMessageModel:
             assert "manager_name" in conv
             assert len(conv["messages"]) >= 1
 
+    def test_get_recent_across_connections_pages(self, make_connection, make_worker):
+        import models.message as message_model
+        import models.connection as connection_model
+        _, _, conn1 = make_connection(1001, 2001, bot_slot=1)
+        make_worker(2002, "Worker2")
+        make_worker(2003, "Worker3")
+        cid2 = connection_model.create(1001, 2002, bot_slot=2)
+        cid3 = connection_model.create(1001, 2003, bot_slot=3)
+        message_model.save(conn1["connection_id"], 1001, "a", "b")
+        message_model.save(cid3, 1001, "c", "d")
+        # Most recently active first; cid2 has no messages so takes no slot
+        page = message_model.get_recent_across_connections(limit=1, offset=1)
+        assert [c["connection_id"] for c in page] == [conn1["connection_id"]]
+        assert [c["connection_id"] for c in message_model.get_recent_across_connections()] == \
+            [cid3, conn1["connection_id"]]
+        assert cid2 not in [c["connection_id"] for c in message_model.get_recent_across_connections()]
+
+    def test_get_recent_across_connections_display_fields(self, make_connection):
+        """Sender role and HH:MM time are precomputed by the query."""
+        import models.message as message_model
+        _, _, conn = make_connection(1001, 2001)
+        message_model.save(conn["connection_id"], 1001, "from manager", "x")
+        message_model.save(conn["connection_id"], 2001, "from worker", "y")
+        msgs = message_model.get_recent_across_connections()[0]["messages"]
+        assert [m["is_manager"] for m in msgs] == [True, False]
+        assert msgs[0]["time_str"] == msgs[0]["sent_at"].strftime("%H:%M")
+
 
 # ====================================================================
 # TASK MODEL
@@ -497,6 +631,32 @@ class TestSubscriptionModel:
         sub_model.save(1002, status="cancelled")
         assert len(sub_model.get_all()) == 2
 
+    def test_get_all_formats_dates(self, make_manager):
+        import models.subscription as sub_model
+        make_manager(1001, code="BRIDGE-10001")
+        sub_model.save(1001, status="active", renews_at="2025-03-01T12:00:00Z")
+        sub = sub_model.get_all()[0]
+        assert sub["renews_at_str"] == "2025-03-01"
+        assert sub["ends_at_str"] is None
+        assert sub["started_at_str"] == sub["created_at"].strftime("%Y-%m-%d")
+
+    def test_get_by_managers(self, make_manager):
+        import models.subscription as sub_model
+        make_manager(1001, code="BRIDGE-10001")
+        make_manager(1002, name="M2", code="BRIDGE-10002")
+        sub_model.save(1001, status="active")
+        subs = sub_model.get_by_managers([1001, 1002])
+        assert list(subs) == [1001]
+        assert subs[1001]["status"] == "active"
+
+    def test_count_by_statuses(self, make_manager):
+        import models.subscription as sub_model
+        for i, status in enumerate(["active", "cancelled", "expired"]):
+            make_manager(1001 + i, name=f"M{i}", code=f"BRIDGE-1000{i + 1}")
+            sub_model.save(1001 + i, status=status)
+        assert sub_model.count_by_statuses(("active", "cancelled")) == 2
+        assert sub_model.count_by_statuses(("paused",)) == 0
+
 
 # ====================================================================
 # USAGE MODEL
@@ -564,6 +724,15 @@ class TestUsageModel:
         usage_model.increment(1001)
         assert len(usage_model.get_all()) == 1
 
+    def test_get_many(self, make_manager):
+        import models.usage as usage_model
+        make_manager(1001, code="BRIDGE-10001")
+        make_manager(1002, name="M2", code="BRIDGE-10002")
+        usage_model.increment(1001)
+        usage = usage_model.get_many([1001, 1002])
+        assert list(usage) == [1001]
+        assert usage[1001]["messages_sent"] == 1
+
     def test_get_stats(self, make_manager):
         import models.usage as usage_model
         make_manager(1001, code="BRIDGE-10001")
@@ -588,6 +757,7 @@ class TestFeedbackModel:
         assert len(fb) == 1
         assert fb[0]["message"] == "Great app!"
         assert fb[0]["status"] == "unread"
+        assert fb[0]["created_at_str"] == fb[0]["created_at"].strftime("%Y-%m-%d %H:%M")
 
     def test_mark_as_read(self):
         import models.feedback as feedback_model
@@ -607,3 +777,29 @@ class TestFeedbackModel:
         for i in range(10):
             feedback_model.save(1000 + i, message=f"msg{i}")
         assert len(feedback_model.get_all(limit=5)) == 5
+
+
+# ====================================================================
+# DB CONNECTION HELPERS
+# ====================================================================
+
+class TestExecutePrepared:
+    """utils.db_connection.execute_prepared — PREPARE once, EXECUTE after."""
+
+    def test_prepares_once_per_connection(self, make_user):
+        from utils.db_connection import get_db_connection, return_connection, execute_prepared
+        make_user(1001, language="Hebrew")
+        sql = "SELECT language FROM users WHERE user_id = $1"
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            execute_prepared(cur, "test_user_language", sql, (1001,))
+            assert cur.fetchone() == ("Hebrew",)
+            execute_prepared(cur, "test_user_language", sql, (9999,))
+            assert cur.fetchone() is None
+            cur.execute("SELECT COUNT(*) FROM pg_prepared_statements WHERE name = 'test_user_language'")
+            assert cur.fetchone()[0] == 1
+            cur.close()
+            conn.rollback()
+        finally:
+            return_connection(conn)
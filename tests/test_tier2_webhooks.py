@@ -107,6 +107,59 @@ class TestWebhookSignature:
         resp = post_webhook(dashboard_client, payload)
         assert resp.status_code == 200
 
+    def test_notification_sent_off_request_thread(self, dashboard_client, make_manager, monkeypatch):
+        """The webhook returns before the Telegram notification goes out."""
+        import threading
+        import dashboard as dashboard_mod
+        release = threading.Event()
+        sent = []
+
+        def slow_send(chat_id, text):
+            release.wait(5)
+            sent.append((chat_id, threading.current_thread().name))
+
+        monkeypatch.setattr(dashboard_mod, "send_telegram_notification", slow_send)
+        make_manager(1001, code="BRIDGE-10001")
+        resp = post_webhook(dashboard_client, make_payload("subscription_created", telegram_id="1001"))
+        assert resp.status_code == 200
+        assert sent == []
+        release.set()
+        dashboard_mod._notify_executor.shutdown(wait=True)
+        assert sent[0][0] == 1001
+        assert sent[0][1].startswith("telegram-notify")
+
+    def test_non_ascii_signature_rejected(self, dashboard_client):
+        resp = dashboard_client.post(
+            "/webhook/lemonsqueezy",
+            data=b'{"test":true}',
+            content_type="application/json",
+            headers={"X-Signature": "ñ" * 64}
+        )
+        assert resp.status_code == 401
+
+    def test_metrics_count_handled_events(self, dashboard_client, make_manager, monkeypatch):
+        import dashboard as dashboard_mod
+        monkeypatch.setattr(dashboard_mod, "METRICS_TOKEN", "scrape-token")
+        make_manager(1001, code="BRIDGE-10001")
+        post_webhook(dashboard_client, make_payload("subscription_created", telegram_id="1001"))
+        post_webhook(dashboard_client, make_payload("no_such_event", telegram_id="1001"))
+        resp = dashboard_client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+        assert resp.status_code == 200
+        body = resp.data.decode()
+        assert 'bridgeos_webhook_handler_seconds_count{event="subscription_created"} 1' in body
+        assert "no_such_event" not in body
+
+    def test_metrics_require_token_or_login(self, dashboard_client, monkeypatch):
+        import dashboard as dashboard_mod
+        assert dashboard_client.get("/metrics").status_code == 401
+        monkeypatch.setattr(dashboard_mod, "METRICS_TOKEN", "scrape-token")
+        assert dashboard_client.get("/metrics").status_code == 401
+        wrong = dashboard_client.get("/metrics", headers={"Authorization": "Bearer nope"})
+        assert wrong.status_code == 401
+        with dashboard_client.session_transaction() as sess:
+            sess["authenticated"] = True
+        assert dashboard_client.get("/metrics").status_code == 200
+
     def test_tampered_payload_rejected(self, dashboard_client):
         original = json.dumps({"amount": 9}).encode()
         sig = sign_payload(original)
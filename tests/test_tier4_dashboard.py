@@ -67,6 +67,18 @@ class TestAuth:
         resp = client.post("/login", data={"password": "wrong"})
         assert b"Invalid password" in resp.data
 
+    def test_login_with_password_hash(self, app, client):
+        import dashboard as dashboard_mod
+        from werkzeug.security import generate_password_hash
+        dashboard_mod.DASHBOARD_PASSWORD_HASH = generate_password_hash("hashed_pw")
+        assert b"Invalid password" in client.post("/login", data={"password": "test_password"}).data
+        resp = client.post("/login", data={"password": "hashed_pw"}, follow_redirects=False)
+        assert resp.status_code == 302
+
+    def test_login_session_is_permanent(self, client):
+        resp = client.post("/login", data={"password": "test_password"}, follow_redirects=False)
+        assert "Expires=" in resp.headers["Set-Cookie"]
+
     def test_logout(self, client):
         login(client)
         client.get("/logout")
@@ -112,6 +124,103 @@ class TestHealthCheck:
         assert resp.status_code == 200
         assert json.loads(resp.data)["status"] == "healthy"
 
+    def test_healthz_alias(self, client):
+        resp = client.get("/healthz")
+        assert resp.status_code == 200
+        assert json.loads(resp.data)["status"] == "healthy"
+
+    def test_health_skips_session(self, app, client):
+        class NoSessions:
+            def open_session(self, app, request):
+                raise AssertionError("session opened for a health probe")
+        app.session_interface = NoSessions()
+        client.set_cookie("session", "garbage")
+        resp = client.get("/health")
+        assert resp.status_code == 200
+        assert "Set-Cookie" not in resp.headers
+
+
+# ====================================================================
+# RESPONSE COMPRESSION
+# ====================================================================
+
+class TestCompression:
+
+    def test_html_gzipped_when_accepted(self, client):
+        import gzip
+        resp = client.get("/login", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        assert b"Enter dashboard password" in gzip.decompress(resp.data)
+
+    def test_plain_without_accept_encoding(self, client):
+        resp = client.get("/login")
+        assert "Content-Encoding" not in resp.headers
+        assert b"Enter dashboard password" in resp.data
+
+    def test_streamed_page_gzipped(self, client):
+        import gzip
+        login(client)
+        resp = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert b"</html>" in gzip.decompress(resp.data)
+
+    def test_small_bodies_left_alone(self, client):
+        resp = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in resp.headers
+
+
+# ====================================================================
+# STATIC STYLESHEETS AND SCRIPTS
+# ====================================================================
+
+class TestStylesheets:
+
+    def test_served_with_cache_headers(self, client):
+        resp = client.get("/static/dashboard.css")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/css"
+        assert "max-age" in resp.headers["Cache-Control"]
+        assert resp.headers["ETag"]
+
+    def test_revalidation_returns_304(self, client):
+        etag = client.get("/static/login.css").headers["ETag"]
+        resp = client.get("/static/login.css", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+    def test_manager_detail_links_stylesheet(self, client, make_manager):
+        make_manager(1001, code="BRIDGE-10001")
+        login(client)
+        resp = client.get("/manager/1001")
+        assert b'href="/static/manager_detail.css?v=' in resp.data
+        assert b"<style>" not in resp.data
+        assert client.get("/static/manager_detail.css").status_code == 200
+
+    def test_unknown_stylesheet_404(self, client):
+        assert client.get("/static/nope.css").status_code == 404
+
+    def test_manager_detail_script_is_static(self, client, make_manager):
+        make_manager(1001, code="BRIDGE-10001")
+        login(client)
+        html = client.get("/manager/1001").data
+        assert b'<script src="/static/manager_detail.js?v=' in html
+        assert b"function showHistory" not in html
+        assert b'data-manager-id="1001"' in html
+        resp = client.get("/static/manager_detail.js")
+        assert resp.mimetype == "text/javascript"
+        assert b"function showHistory" in resp.data
+        assert "immutable" in resp.headers["Cache-Control"]
+
+    def test_pages_and_assets_served_without_indentation(self, client):
+        for url in ("/login", "/static/login.css", "/static/manager_detail.js"):
+            lines = client.get(url).data.decode().splitlines()
+            assert lines and all(line and not line[0].isspace() for line in lines)
+
+    def test_pages_link_versioned_stylesheet(self, client):
+        resp = client.get("/login")
+        assert b'href="/static/login.css?v=' in resp.data
+        assert b"<style>" not in resp.data
+
 
 # ====================================================================
 # DASHBOARD MAIN PAGE
@@ -126,6 +235,21 @@ class TestDashboardPage:
         assert resp.status_code == 200
         assert b"BridgeOS Dashboard" in resp.data
 
+    def test_etag_not_modified(self, client, make_manager):
+        import dashboard as dashboard_mod
+        make_manager(1001)
+        login(client)
+        first = client.get("/")
+        assert b"BridgeOS Dashboard" in first.data
+        etag = first.headers["ETag"]
+        assert client.get("/", headers={"If-None-Match": etag}).status_code == 304
+
+        make_manager(1002, name="M2", code="BRIDGE-10002")
+        dashboard_mod.invalidate_dashboard_cache()
+        changed = client.get("/", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert b"BridgeOS Dashboard" in changed.data
+
     def test_renders_with_data(self, client, make_connection):
         """Dashboard renders with managers, workers, connections."""
         import models.message as message_model
@@ -142,6 +266,170 @@ class TestDashboardPage:
         assert resp.status_code == 200
         assert b"BridgeOS Dashboard" in resp.data
 
+    def test_icons_are_real_utf8(self, client):
+        login(client)
+        html = client.get("/").data.decode("utf-8")
+        assert "🌉 BridgeOS Dashboard" in html
+        assert "ð" not in html
+
+    def test_streamed_with_session_csrf_token(self, client, make_manager):
+        """The page streams, but its CSRF token is stored before streaming starts."""
+        make_manager(1001)
+        login(client)
+        resp = client.get("/")
+        assert resp.is_streamed
+        with client.session_transaction() as sess:
+            token = sess["csrf_token"]
+        assert f'name="csrf_token" value="{token}"'.encode() in resp.data
+
+    def test_status_badges(self, client, make_manager):
+        import models.subscription as sub_model
+        import models.feedback as feedback_model
+        make_manager(1001, code="BRIDGE-10001")
+        sub_model.save(1001, status="paused")
+        feedback_model.save(1001, telegram_name="Alice", message="Hi")
+
+        login(client)
+        html = client.get("/").data.decode()
+        assert '<span class="badge disconnected">⏸️ Paused</span>' in html
+        assert '<span class="badge disconnected">⭕ Unread</span>' in html
+        assert "💳 Paused" in html
+        assert "<strong>Plan:</strong> Monthly" in html
+
+    def test_cached_between_requests(self, client, make_manager):
+        """Data created within the cache TTL isn't visible until it expires."""
+        import dashboard as dashboard_mod
+        login(client)
+        assert b"No managers registered yet." in client.get("/").data
+
+        make_manager(1001, code="BRIDGE-10001")
+        assert b"No managers registered yet." in client.get("/").data
+
+        dashboard_mod.invalidate_dashboard_cache()
+        assert b"BRIDGE-10001" in client.get("/").data
+
+    def test_admin_action_invalidates_cache(self, client):
+        """Mutating routes drop the cached data so changes show immediately."""
+        import models.feedback as feedback_model
+        login(client)
+        assert b"No feedback received yet." in client.get("/").data
+
+        feedback_model.save(1001, telegram_name="Alice", message="Bug!")
+        fb_id = feedback_model.get_all()[0]["feedback_id"]
+        token = get_csrf(client)
+        client.post(f"/mark_feedback_read/{fb_id}", data={"csrf_token": token})
+        assert b"Bug!" in client.get("/").data
+
+
+class TestDashboardFragment:
+
+    def test_requires_login(self, client):
+        resp = client.get("/api/dashboard")
+        assert resp.status_code == 401
+
+    def test_json_provider_matches_flask_default(self, app):
+        from datetime import datetime, timezone
+        from decimal import Decimal
+        from flask.json.provider import DefaultJSONProvider
+        import dashboard as dashboard_mod
+        row = dashboard_mod.MessageRow("12:30", "hola", True)
+        data = {"b": datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc), "a": row,
+                "counts": {7: Decimal("1.5")}, "text": "שלום"}
+        assert json.loads(app.json.dumps(data)) == json.loads(DefaultJSONProvider(app).dumps(data))
+        assert app.json.loads('{"x": [1, 2]}') == {"x": [1, 2]}
+
+    def test_returns_rendered_sections(self, client, make_connection):
+        import models.feedback as feedback_model
+        import models.subscription as sub_model
+        make_connection(1001, 2001, bot_slot=1)
+        feedback_model.save(1001, telegram_name="Alice", message="Great!")
+        sub_model.save(1001, status="active")
+
+        login(client)
+        html = client.get("/api/dashboard").data.decode()
+        for section_id in ("last-updated", "stats", "managers-list", "workers-list",
+                           "subscriptions-list", "feedback-list"):
+            assert f'id="{section_id}"' in html
+        assert "Bot BOT1: Worker 2001" in html
+        assert "Workers (1 connected):" in html
+        assert "Great!" in html
+        assert "💳 Active" in html
+        assert "<html" not in html
+
+    def test_sections_match_page(self, client, make_connection):
+        make_connection(1001, 2001, bot_slot=1)
+        login(client)
+        page = client.get("/").data.decode()
+        fragment = client.get("/api/dashboard").data.decode()
+        start = fragment.index('<div id="managers-list">')
+        managers = fragment[start:fragment.index('<div id="workers-list">')]
+        assert managers in page
+
+    def test_unchanged_data_revalidates_304(self, client, make_manager):
+        import dashboard as dashboard_mod
+        make_manager(1001)
+        login(client)
+        first = client.get("/api/dashboard")
+        etag = first.headers["ETag"]
+        dashboard_mod.invalidate_dashboard_cache()
+        again = client.get("/api/dashboard", headers={"If-None-Match": f"W/{etag}"})
+        assert again.status_code == 304
+
+        make_manager(1002, name="M2", code="BRIDGE-10002")
+        dashboard_mod.invalidate_dashboard_cache()
+        changed = client.get("/api/dashboard", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert "Manager ID: 1002" in changed.data.decode()
+
+    def test_page_polls_instead_of_meta_refresh(self, client):
+        login(client)
+        resp = client.get("/")
+        assert b'http-equiv="refresh"' not in resp.data
+        assert b"/api/dashboard" in resp.data
+        assert b"renderManager" not in resp.data
+
+
+class TestConversationsFragment:
+
+    def test_requires_login(self, client):
+        assert client.get("/api/conversations").status_code == 401
+
+    def test_loaded_lazily(self, client, make_connection):
+        """Messages are served by the fragment endpoint, not the main page."""
+        import models.message as message_model
+        _, _, conn = make_connection(1001, 2001, bot_slot=1)
+        message_model.save(conn["connection_id"], 1001, "Hello there", "Hola")
+
+        login(client)
+        assert b"Hello there" not in client.get("/").data
+        resp = client.get("/api/conversations")
+        assert resp.status_code == 200
+        assert b"Hello there" in resp.data
+        assert b"<html" not in resp.data
+
+    def test_empty(self, client):
+        login(client)
+        assert b"No conversations yet." in client.get("/api/conversations").data
+
+    def test_paged(self, client, make_connection, make_worker, monkeypatch):
+        import dashboard as dashboard_mod
+        import models.connection as connection_model
+        import models.message as message_model
+        monkeypatch.setattr(dashboard_mod, "CONVERSATIONS_PAGE_SIZE", 1)
+        _, _, conn = make_connection(1001, 2001, bot_slot=1)
+        make_worker(2002, name="W2")
+        cid2 = connection_model.create(1001, 2002, 2)
+        message_model.save(cid2, 1001, "second conv", "y")
+        message_model.save(conn["connection_id"], 1001, "first conv", "x")
+
+        login(client)
+        first = client.get("/api/conversations").data
+        assert b"first conv" in first and b"second conv" not in first
+        assert b"loadConversations(1)" in first
+        second = client.get("/api/conversations?offset=1").data
+        assert b"second conv" in second and b"conversations-more" not in second
+        assert b"No conversations yet." not in client.get("/api/conversations?offset=2").data
+
 
 # ====================================================================
 # MANAGER DETAIL PAGE
@@ -158,6 +446,139 @@ class TestManagerDetail:
         resp = client.get("/manager/1001")
         assert resp.status_code == 200
         assert b"Manager Details" in resp.data
+        assert b"Test msg" in resp.data  # translation context
+        assert b'class="message from-manager"' in resp.data
+        assert b"Bot BOT1 - Worker 2001" in resp.data
+
+    def test_subscription_from_version_row(self, client, make_manager, monkeypatch):
+        import models.subscription as sub_model
+        make_manager(1001, code="BRIDGE-10001")
+        sub_model.save(1001, status="active", renews_at="2025-03-01T12:00:00Z",
+                       customer_portal_url="https://portal.example/1001")
+        monkeypatch.setattr(sub_model, "get_by_manager",
+                            lambda *a: pytest.fail("subscription fetched separately"))
+        login(client)
+        html = client.get("/manager/1001").data.decode()
+        assert "<value>2025-03-01</value>" in html
+        assert 'href="https://portal.example/1001"' in html
+
+    def test_rendered_page_cached_until_version_changes(self, client, make_connection, monkeypatch):
+        import dashboard as dashboard_mod
+        import models.message as message_model
+        _, _, conn = make_connection(1001, 2001, bot_slot=1)
+        message_model.save(conn["connection_id"], 1001, "first", "primero")
+
+        login(client)
+        first = client.get("/manager/1001").data
+        renders = []
+        real_render = dashboard_mod._stream_manager_detail
+        monkeypatch.setattr(dashboard_mod, "_stream_manager_detail",
+                            lambda uid, version: renders.append(uid) or real_render(uid, version))
+        assert client.get("/manager/1001").data == first
+        assert renders == []
+
+        message_model.save(conn["connection_id"], 2001, "second", "segundo")
+        assert b"second" in client.get("/manager/1001").data
+        assert renders == [1001]
+
+    def test_forms_carry_session_csrf_token(self, client, make_connection):
+        make_connection(1001, 2001, bot_slot=1)
+        login(client)
+        html = client.get("/manager/1001").data.decode()
+        with client.session_transaction() as sess:
+            token = sess["csrf_token"]
+        assert html.count(f'<input type="hidden" name="csrf_token" value="{token}">') == 3
+
+    def test_etag_not_modified(self, client, make_connection):
+        import models.message as message_model
+        _, _, conn = make_connection(1001, 2001, bot_slot=1)
+        login(client)
+        first = client.get("/manager/1001")
+        assert b"Manager Details" in first.data
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "private, no-cache"
+
+        again = client.get("/manager/1001", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        # Compressed responses carry a weak ETag, which browsers send back as W/"..."
+        weak = client.get("/manager/1001", headers={"If-None-Match": f"W/{etag}"})
+        assert weak.status_code == 304
+        assert again.data == b""
+
+        message_model.save(conn["connection_id"], 2001, "new", "nuevo")
+        changed = client.get("/manager/1001", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert b"new" in changed.data
+        assert changed.headers["ETag"] != etag
+
+    def test_page_is_streamed(self, client, make_connection):
+        make_connection(1001, 2001, bot_slot=1)
+        login(client)
+        resp = client.get("/manager/1001")
+        assert resp.is_streamed
+        assert b"Manager Details" in resp.data
+
+    def test_first_worker_tab_active_server_side(self, client, make_connection, make_worker):
+        import models.connection as connection_model
+        make_connection(1001, 2001, bot_slot=1)
+        make_worker(2002, name="W2")
+        connection_model.create(1001, 2002, 2)
+        login(client)
+        html = client.get("/manager/1001").data.decode()
+        assert 'class="worker-tab active" id="tab-2001"' in html
+        assert 'class="worker-section active" id="worker-2001"' in html
+        assert 'class="worker-tab" id="tab-2002"' in html
+        assert "DOMContentLoaded" not in html
+
+    def test_message_text_still_escaped(self, client, make_connection):
+        import models.message as message_model
+        _, _, conn = make_connection(1001, 2001, bot_slot=1)
+        message_model.save(conn["connection_id"], 2001, "<b>hi</b>", "x")
+        login(client)
+        html = client.get("/manager/1001").data
+        assert b"&lt;b&gt;hi&lt;/b&gt;" in html
+        assert b"<strong>Worker</strong>" in html
+
+    def test_history_loaded_on_demand(self, client, make_connection):
+        """Full history isn't inlined; the page links to the paged endpoint."""
+        import models.message as message_model
+        _, _, conn = make_connection(1001, 2001, bot_slot=1)
+        cid = conn["connection_id"]
+        for i in range(8):
+            message_model.save(cid, 1001, f"old{i}", f"t{i}")
+
+        login(client)
+        html = client.get("/manager/1001").data.decode()
+        assert "old0" not in html
+        assert f"/manager/1001/history/{cid}" in html
+        assert "(8 messages total)" in html
+
+    def test_history_pages(self, client, make_connection, monkeypatch):
+        import dashboard as dashboard_mod
+        import models.message as message_model
+        monkeypatch.setattr(dashboard_mod, "HISTORY_PAGE_SIZE", 3)
+        _, _, conn = make_connection(1001, 2001, bot_slot=1)
+        cid = conn["connection_id"]
+        for i in range(5):
+            message_model.save(cid, 1001 if i % 2 == 0 else 2001, f"m{i}", f"t{i}")
+
+        login(client)
+        first = client.get(f"/manager/1001/history/{cid}").get_json()
+        assert [m["text"] for m in first["messages"]] == ["m0", "m1", "m2"]
+        assert [m["is_manager"] for m in first["messages"]] == [True, False, True]
+        assert first["next_offset"] == 3
+        second = client.get(f"/manager/1001/history/{cid}?offset=3").get_json()
+        assert [m["text"] for m in second["messages"]] == ["m3", "m4"]
+        assert second["next_offset"] is None
+
+    def test_history_rejects_other_managers_connection(self, client, make_connection):
+        _, _, conn = make_connection(1001, 2001, bot_slot=1)
+        login(client)
+        resp = client.get(f"/manager/1002/history/{conn['connection_id']}")
+        assert resp.status_code == 404
+
+    def test_history_requires_login(self, client):
+        assert client.get("/manager/1001/history/1").status_code == 401
 
     def test_redirects_for_nonexistent_manager(self, client):
         login(client)
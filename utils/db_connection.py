@@ -34,6 +34,7 @@ Last Updated: January 2025
 """
 
 import os
+import weakref
 from psycopg2 import pool
 from contextlib import contextmanager
 from typing import Optional
@@ -41,6 +42,9 @@ from typing import Optional
 # Global connection pool - initialized once at application startup
 _connection_pool: Optional[pool.SimpleConnectionPool] = None
 
+# Names of the statements already PREPAREd on each pooled connection
+_prepared_statements = weakref.WeakKeyDictionary()
+
 
 def init_connection_pool(min_conn: int = 5, max_conn: int = 20) -> None:
     """
@@ -275,6 +279,34 @@ def get_db_cursor(commit: bool = True):
         return_connection(conn)
 
 
+def execute_prepared(cur, name: str, sql: str, params: tuple) -> None:
+    """
+    Execute a query as a server-side prepared statement.
+    
+    The first call on each pooled connection runs PREPARE, so PostgreSQL parses
+    and plans the query once per connection; later calls only send EXECUTE.
+    Use it for hot, fixed-text queries (e.g. the dashboard manager page).
+    
+    Args:
+        cur: Cursor from get_db_cursor()
+        name (str): Statement name, unique per SQL text
+        sql (str): Query using $1, $2, ... placeholders (not %s)
+        params (tuple): Values for the placeholders, in order
+    
+    Example:
+        with get_db_cursor(commit=False) as cur:
+            execute_prepared(cur, "user_language",
+                             "SELECT language FROM users WHERE user_id = $1", (user_id,))
+            row = cur.fetchone()
+    """
+    prepared = _prepared_statements.setdefault(cur.connection, set())
+    if name not in prepared:
+        cur.execute(f"PREPARE {name} AS {sql}")
+        prepared.add(name)
+    placeholders = ", ".join(["%s"] * len(params))
+    cur.execute(f"EXECUTE {name} ({placeholders})", params)
+
+
 def close_all_connections() -> None:
     """
     Close all connections in the pool and destroy the pool.
@@ -351,6 +383,7 @@ __all__ = [
     'get_db_connection',
     'return_connection',
     'get_db_cursor',
+    'execute_prepared',
     'close_all_connections',
     'get_pool_status'
 ]